@@ -1,5 +1,68 @@
-# api/config.py
+import os
+
 EMAIL_COLUMN = 'email_addr'
 # SHEETS_TO_CHECK = ["PREMIUM", "GSUITE", "GMAIL", "OFFICE", "OUTLOOK", "HOTMAIL", "YAHOO", "AOL", "COMCAST", "MAIL", "EARTHLINK", "COX"]
 SHEETS_TO_CHECK = ["GMAIL", "AOL", "OUTLOOK", "HOTMAIL"]
-VERIFIED_SHEET_NAME = 'VERIFIED'
\ No newline at end of file
+VERIFIED_SHEET_NAME = 'VERIFIED'
+
+# Sheet storage backend: 'google' (live spreadsheet) or 'sqlite' (local file / in-memory, for offline runs)
+SHEET_STORE_BACKEND = os.getenv('SHEET_STORE_BACKEND', 'google')
+SQLITE_STORE_PATH = os.getenv('SQLITE_STORE_PATH', ':memory:')
+# Points the google backend at another Sheets REST endpoint (e.g. the benchmarks' fake server), with anonymous credentials
+SHEETS_API_ENDPOINT = os.getenv('SHEETS_API_ENDPOINT', '')
+
+# Blocking sheet I/O runs on a bounded thread pool so it never stalls the event loop
+SHEETS_IO_MAX_WORKERS = int(os.getenv('SHEETS_IO_MAX_WORKERS', '4'))
+SHEETS_IO_TIMEOUT = float(os.getenv('SHEETS_IO_TIMEOUT', '120'))  # seconds per offloaded call
+
+# Background jobs
+VERIFY_INTERVAL = float(os.getenv('VERIFY_INTERVAL', '60'))  # seconds between verification cycles
+VERIFY_MAX_INTERVAL = float(os.getenv('VERIFY_MAX_INTERVAL', '300'))  # poll interval cap for sheets that stay unchanged
+JOB_JITTER = 0.1  # up to 10% random delay added to each wait, spreads out workers and retries
+JOB_MAX_BACKOFF = 900  # seconds, cap for the exponential backoff after failed runs
+SCHEDULER_LOCK_DIR = os.getenv('SCHEDULER_LOCK_DIR', '')  # defaults to the system temp dir
+
+# Sheets API quota (per-minute limits of the service account) and retry policy
+SHEETS_READ_QUOTA_PER_MINUTE = int(os.getenv('SHEETS_READ_QUOTA_PER_MINUTE', '60'))
+SHEETS_WRITE_QUOTA_PER_MINUTE = int(os.getenv('SHEETS_WRITE_QUOTA_PER_MINUTE', '60'))
+SHEETS_MAX_RETRIES = 5
+SHEETS_RETRY_BASE_DELAY = 1.0  # seconds, doubled on every retry
+SHEETS_RETRY_MAX_DELAY = 64.0
+# Seconds an offloaded sheet call may spend retrying; stays below SHEETS_IO_TIMEOUT so the caller sees the real error
+SHEETS_RETRY_DEADLINE = float(os.getenv('SHEETS_RETRY_DEADLINE', str(SHEETS_IO_TIMEOUT * 0.75)))
+
+# Verification streams each sheet in pages and commits every page's moves as one journaled chunk
+VERIFY_PAGE_SIZE = int(os.getenv('VERIFY_PAGE_SIZE', '500'))
+MOVE_JOURNAL_PATH = os.getenv('MOVE_JOURNAL_PATH', '')  # defaults to a file in the system temp dir
+
+# Routing of new rows out of PROCESSOR and cross-sheet duplicate removal
+PROCESSOR_SHEET_NAME = 'PROCESSOR'
+MOVE_AND_REMOVE_SHEETS_TO_CHECK = ["VERIFIED", "GMAIL", "OUTLOOK", "HOTMAIL", "AOL", "EARTHLINK", "MAIL", "COX", "YAHOO", "PREMIUM"]
+DEDUP_INTERVAL = float(os.getenv('DEDUP_INTERVAL', '3600'))  # seconds between routing/dedup cycles
+EMAIL_INDEX_PATH = os.getenv('EMAIL_INDEX_PATH', '')  # defaults to a file in the system temp dir
+
+# MX lookups used to route domains that are not in the provider map
+MX_CACHE_SIZE = 50000  # domains kept in the LRU cache
+MX_MIN_TTL = 60  # seconds; record TTLs are clamped to [MX_MIN_TTL, MX_MAX_TTL]
+MX_MAX_TTL = 86400
+MX_NEGATIVE_TTL = 900  # seconds to remember NXDOMAIN / no-MX answers
+MX_MAX_CONCURRENCY = 20  # DNS queries in flight at once
+MX_TIMEOUT = 5.0  # seconds per lookup
+
+# Domain classification tables, reloaded when the files change
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+DISPOSABLE_DOMAINS_FILE = os.getenv('DISPOSABLE_DOMAINS_FILE', os.path.join(DATA_DIR, 'disposable_domains.txt'))
+PROVIDER_DOMAINS_FILE = os.getenv('PROVIDER_DOMAINS_FILE', os.path.join(DATA_DIR, 'provider_domains.txt'))
+DOMAIN_TABLE_RELOAD_INTERVAL = 5.0  # seconds between checks of the files' modification time
+
+# Cold start: serverless deployments only serve requests, background jobs need a long-running server
+SERVERLESS = bool(os.getenv('VERCEL')) or os.getenv('SERVERLESS', '') == '1'
+SHEETS_DISCOVERY_DOCUMENT = os.getenv('SHEETS_DISCOVERY_DOCUMENT', os.path.join(DATA_DIR, 'sheets.v4.json'))
+
+# Instrumentation served at /api/metrics and /api/profile
+EVENT_LOOP_LAG_INTERVAL = 0.5  # seconds between event loop lag samples
+PROFILE_SAMPLE_INTERVAL = 0.005  # seconds between stack samples while a profiled job runs
+
+# Shared outbound HTTP client (email verifier)
+HTTP_CLIENT_TIMEOUT = 30.0  # seconds
+HTTP_MAX_CONNECTIONS = 100
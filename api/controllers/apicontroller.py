@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Query, HTTPException
 from pydantic import BaseModel, EmailStr
 import logging
+from ..services.json_responses import FastJSONRoute, PrebuiltJSONResponse, prebuilt
 
 # Initialize the router
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -36,40 +37,44 @@ class VerifyEmailResponse(BaseModel):
     reason: str
     disposable: bool
 
-def is_disposable_email(domain: str) -> bool:
-    disposable_domains = ["mailinator.com", "trashmail.com", "tempmail.com"]  # Add more disposable domains here
-    return domain in disposable_domains
+# Constant payloads, serialized once at import
+HELLO_WORLD = prebuilt({"message": "Hello World"})
+EMAIL_SENT = prebuilt({"status": "success", "detail": "Email sent"})
+TEXT_SENT = prebuilt({"status": "success", "detail": "Text message sent"})
+WALLET_VERIFIED = prebuilt({"status": "success", "detail": "Wallet verified"})
+BALANCE = prebuilt({"status": "success", "balance": "100.00"})
+BALANCE_TRANSFERRED = prebuilt({"status": "success", "detail": "Balance transferred"})
 
 @router.get("/api/python")
-def hello_world():
-    return {"message": "Hello World"}
+async def hello_world():
+    return PrebuiltJSONResponse(HELLO_WORLD)
 
 @router.post("/api/send-email")
-def send_email(request: SendEmailRequest):
+async def send_email(request: SendEmailRequest):
     # Process sending email
     logger.info(f"Sending email to {request.recipient} with subject {request.subject}")
-    return {"status": "success", "detail": "Email sent"}
+    return PrebuiltJSONResponse(EMAIL_SENT)
 
 @router.post("/api/send-text")
-def send_text(request: SendTextRequest):
+async def send_text(request: SendTextRequest):
     # Process sending text message
     logger.info(f"Sending text to {request.phone_number}")
-    return {"status": "success", "detail": "Text message sent"}
+    return PrebuiltJSONResponse(TEXT_SENT)
 
 @router.post("/api/verify-wallet")
-def verify_wallet(request: VerifyWalletRequest):
+async def verify_wallet(request: VerifyWalletRequest):
     # Process wallet verification
     logger.info(f"Verifying wallet ID {request.wallet_id}")
-    return {"status": "success", "detail": "Wallet verified"}
+    return PrebuiltJSONResponse(WALLET_VERIFIED)
 
 @router.post("/api/check-balance")
-def check_balance(request: CheckBalanceRequest):
+async def check_balance(request: CheckBalanceRequest):
     # Process checking balance
     logger.info(f"Checking balance for wallet ID {request.wallet_id}")
-    return {"status": "success", "balance": "100.00"}
+    return PrebuiltJSONResponse(BALANCE)
 
 @router.post("/api/transfer-balance")
-def transfer_balance(request: TransferBalanceRequest):
+async def transfer_balance(request: TransferBalanceRequest):
     # Process balance transfer
     logger.info(f"Transferring {request.amount} from wallet ID {request.from_wallet_id} to wallet ID {request.to_wallet_id}")
-    return {"status": "success", "detail": "Balance transferred"}
+    return PrebuiltJSONResponse(BALANCE_TRANSFERRED)
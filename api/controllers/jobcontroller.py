@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+import logging
+from ..services.metrics import CONTENT_TYPE, registry
+from ..services.profiler import profiler
+from ..services.scheduler import scheduler
+from ..services.quota import governor
+
+# Initialize the router
+router = APIRouter()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+@router.get("/api/jobs")
+def list_jobs():
+    return {"jobs": scheduler.status()}
+
+@router.get("/api/quota")
+def quota_status():
+    return {"sheets": governor.stats()}
+
+@router.get("/api/metrics")
+def metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+@router.post("/api/profile/{job_name}")
+def arm_profiler(job_name: str):
+    """Profiles the next run of a job; fetch the result from GET /api/profile once it has run."""
+    if job_name not in scheduler.jobs:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_name}")
+    profiler.arm(job_name)
+    return {"armed": profiler.armed()}
+
+@router.get("/api/profile")
+def last_profile():
+    profile = profiler.last_profile()
+    if profile is None:
+        raise HTTPException(status_code=404, detail="No profile recorded yet")
+    return PlainTextResponse(profile)
@@ -1,49 +1,88 @@
+from .services.startup import FirstResponseMiddleware, import_timer, mark, startup_report
+import_timer.install()
+
 from fastapi import FastAPI
 import asyncio
 import logging
 from .controllers.usercontroller import router as user_router
 from .controllers.apicontroller import router as api_router
-from .services.verify_emails import verify_emails
-# from .services.google_sheets_utils import move_rows_based_on_email, remove_duplicate_rows
-from .config import EMAIL_COLUMN, SHEETS_TO_CHECK
+from .controllers.jobcontroller import router as job_router
+from .services.json_responses import FastJSONResponse
+from .services.metrics import watch_event_loop_lag
+from .services.scheduler import scheduler
+from .config import SERVERLESS, SHEETS_TO_CHECK, VERIFY_INTERVAL, DEDUP_INTERVAL
 
 # Initialize the FastAPI app
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Event loop lag sampler, running next to the scheduler
+_lag_watcher = None
+
 # Include routers
 app.include_router(user_router)
 app.include_router(api_router)
+app.include_router(job_router)
+
+# Pure ASGI wrapper: once the first response is marked it is a flag check per request
+app.add_middleware(FirstResponseMiddleware)
+
+@app.get("/api/startup")
+def startup_status():
+    return startup_report()
 
 @app.on_event("startup")
 async def startup_event():
+    global _lag_watcher
     logger.info("Starting the FastAPI application")
-    asyncio.create_task(periodic_verification())
-    # asyncio.create_task(sort_and_remove_duplicate())
+    # Both jobs rewrite the same sheets, so they share a leader and never run in different workers
+    scheduler.add_job("verify_emails", periodic_verification, interval=VERIFY_INTERVAL, leader_group="sheets")
+    scheduler.add_job("sort_and_remove_duplicate", sort_and_remove_duplicate, interval=DEDUP_INTERVAL,
+                      leader_group="sheets")
+    if SERVERLESS:
+        # Serverless instances are frozen between requests, so long-running loops would never make progress
+        logger.info("Serverless mode: background jobs are not started")
+    else:
+        scheduler.start()
+        _lag_watcher = asyncio.create_task(watch_event_loop_lag(), name="event-loop-lag")
+    mark("startup_complete")
+    import_timer.uninstall()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    from .services.async_sheet_store import shutdown_async_sheet_store
+    from .services.http_client import close_http_client
+    if _lag_watcher is not None:
+        _lag_watcher.cancel()
+    await scheduler.stop()
+    shutdown_async_sheet_store()
+    await close_http_client()
+
+# The sheet, DNS and HTTP client stacks are imported when a job first runs, not on a cold start
 async def periodic_verification():
-    while True:
-        logger.info("Starting periodic verification cycle")
-        for sheet_name in SHEETS_TO_CHECK:
-            logger.info(f"Checking sheet: {sheet_name}")
-            try:
-                await verify_emails(sheet_name)
-            except Exception as e:
-                logger.error(f"Error during verification for sheet {sheet_name}: {e}")
-        logger.info("Completed periodic verification cycle")
-        await asyncio.sleep(60)  # Run every 5 minutes
-
-# async def sort_and_remove_duplicate():
-#     while True:
-#         logger.info("Starting sort and remove duplicate cycle")
-#         try:
-#             # Run in an executor to avoid blocking the event loop with synchronous code
-#             await asyncio.to_thread(move_rows_based_on_email)
-#             await asyncio.to_thread(remove_duplicate_rows)
-#         except Exception as e:
-#             logger.error(f"Error during sorting and removing duplicates: {e}")
-#         logger.info("Completed sort and remove duplicate cycle")
-#         await asyncio.sleep(60)  # Run every hour
+    from .services.change_gate import get_change_gate
+    from .services.verify_emails import verify_sheets
+    logger.info("Starting periodic verification cycle")
+    gate = get_change_gate()
+    await verify_sheets(SHEETS_TO_CHECK, gate=gate)
+    logger.info("Completed periodic verification cycle")
+    # Sleep until the next sheet is due rather than a fixed interval
+    return gate.next_delay()
+
+async def sort_and_remove_duplicate():
+    from .services.async_sheet_store import get_async_sheet_store
+    from .services.change_gate import get_change_gate
+    from .services.dedup import DedupEngine
+    from .services.email_index import get_email_index
+    logger.info("Starting sort and remove duplicate cycle")
+    store = get_async_sheet_store()
+    async with store.mutation_lock:
+        await DedupEngine(store, get_email_index()).run()
+    # Routing appends rows to the provider sheets, so check them all on the next verification cycle
+    get_change_gate().reset()
+    logger.info("Completed sort and remove duplicate cycle")
+
+mark("app_imported")
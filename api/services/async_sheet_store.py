@@ -0,0 +1,124 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from api.config import SHEETS_IO_MAX_WORKERS, SHEETS_IO_TIMEOUT, SHEETS_RETRY_DEADLINE
+from .quota import retry_deadline
+from .sheet_store import DEFAULT_RANGE, get_sheet_store
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class MutationLock:
+    """asyncio.Lock whose release first waits for the store's calls still running on worker threads.
+
+    A caller that timed out or was cancelled stops waiting, but its call keeps appending and
+    deleting rows on the worker thread; the next pass must not start until it has finished.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self._lock = asyncio.Lock()
+
+    def locked(self):
+        return self._lock.locked()
+
+    async def __aenter__(self):
+        await self._lock.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            await self._store.wait_idle()
+        finally:
+            self._lock.release()
+
+class AsyncSheetStore:
+    """Awaitable facade over a SheetStore that runs its blocking calls on a bounded thread pool.
+
+    At most ``max_workers`` calls run at once; callers beyond that wait on a semaphore, so a
+    cancelled caller never leaves queued work behind. A call already running on a worker
+    thread finishes there, but its result is discarded once the caller is cancelled or
+    times out.
+
+    Passes that read row positions and later delete rows by index must hold
+    ``mutation_lock`` for the whole pass, so they never shift rows under each other. The
+    lock is only released once every call still running on the pool has finished.
+    """
+
+    def __init__(self, store, max_workers=SHEETS_IO_MAX_WORKERS, timeout=SHEETS_IO_TIMEOUT,
+                 retry_time=SHEETS_RETRY_DEADLINE):
+        self.store = store
+        self._timeout = timeout
+        self._retry_time = min(retry_time, timeout * 0.75)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sheets-io')
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._running = set()  # concurrent futures of calls submitted to the pool and not finished yet
+        self.mutation_lock = MutationLock(self)
+
+    async def run(self, func, *args, **kwargs):
+        """Runs a blocking callable on the sheet I/O pool and awaits its result."""
+        async with self._semaphore:
+            # Carry context variables (e.g. the quota priority) over to the worker thread, and stop
+            # retrying the call's Sheets requests before the caller stops waiting for them
+            with retry_deadline(time.monotonic() + self._retry_time):
+                context = contextvars.copy_context()
+            call = self._executor.submit(functools.partial(context.run, func, *args, **kwargs))
+            self._running.add(call)
+            call.add_done_callback(self._running.discard)
+            return await asyncio.wait_for(asyncio.wrap_future(call), self._timeout)
+
+    async def wait_idle(self):
+        """Waits until no call is running on the pool, including ones whose caller gave up."""
+        running = list(self._running)
+        if running:
+            logger.warning(f"Waiting for {len(running)} abandoned sheet call(s) to finish")
+            await asyncio.wait([asyncio.wrap_future(call) for call in running])
+
+    async def read_range(self, sheet_name, cell_range=DEFAULT_RANGE):
+        return await self.run(self.store.read_range, sheet_name, cell_range)
+
+    async def read_ranges(self, ranges):
+        return await self.run(self.store.read_ranges, ranges)
+
+    async def read_frame(self, sheet_name, cell_range=DEFAULT_RANGE, header=None):
+        return await self.run(self.store.read_frame, sheet_name, cell_range, header)
+
+    async def read_row_frames(self, requested, headers=None):
+        return await self.run(self.store.read_row_frames, requested, headers)
+
+    async def append_rows(self, sheet_name, rows):
+        return await self.run(self.store.append_rows, sheet_name, rows)
+
+    async def delete_rows(self, sheet_name, row_indices):
+        return await self.run(self.store.delete_rows, sheet_name, row_indices)
+
+    async def delete_rows_in_sheets(self, deletions):
+        return await self.run(self.store.delete_rows_in_sheets, deletions)
+
+    async def get_sheet_properties(self, sheet_name):
+        return await self.run(self.store.get_sheet_properties, sheet_name)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+_async_store = None
+_async_store_lock = threading.Lock()
+
+def get_async_sheet_store():
+    """Returns the process-wide async facade over get_sheet_store()."""
+    global _async_store
+    with _async_store_lock:
+        if _async_store is None:
+            _async_store = AsyncSheetStore(get_sheet_store())
+        return _async_store
+
+def shutdown_async_sheet_store():
+    global _async_store
+    with _async_store_lock:
+        if _async_store is not None:
+            _async_store.shutdown()
+            _async_store = None
@@ -0,0 +1,82 @@
+import logging
+import threading
+import time
+from api.config import VERIFY_INTERVAL, VERIFY_MAX_INTERVAL
+from .metrics import change_probes_total, poll_interval_seconds
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class ChangeGate:
+    """Decides which sheets a verification cycle reads, backing off on sheets that stay unchanged.
+
+    The first page read of a sheet doubles as its change probe: when nothing was added
+    after the watermark it only returns the fingerprint cell. Each unchanged probe doubles
+    the sheet's poll interval up to ``max_interval``; a probe that finds rows brings it back
+    to ``min_interval``. Sheets never probed yet are always due.
+    """
+
+    def __init__(self, min_interval=VERIFY_INTERVAL, max_interval=VERIFY_MAX_INTERVAL):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self._lock = threading.Lock()
+        self._intervals = {}
+        self._next_due = {}
+
+    def due(self, sheet_names, now=None):
+        """Returns the sheets to read this cycle, in the given order.
+
+        A sheet is taken once it is halfway through its poll interval rather than only when
+        it expires: due sheets share one batched read, and it keeps their schedules aligned.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            due = [sheet_name for sheet_name in sheet_names
+                   if self._next_due.get(sheet_name) is None
+                   or self._next_due[sheet_name] - now <= self._intervals[sheet_name] / 2]
+        if len(due) < len(sheet_names):
+            change_probes_total.inc(len(sheet_names) - len(due), result='skipped')
+        return due
+
+    def record(self, sheet_name, changed, now=None):
+        """Records the outcome of a sheet's probe and schedules its next one."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if changed:
+                interval = self.min_interval
+            else:
+                interval = min(self._intervals.get(sheet_name, self.min_interval) * 2, self.max_interval)
+            self._intervals[sheet_name] = interval
+            self._next_due[sheet_name] = now + interval
+        change_probes_total.inc(result='changed' if changed else 'unchanged')
+        poll_interval_seconds.set(interval, sheet=sheet_name)
+        if not changed:
+            logger.info(f"Sheet {sheet_name} unchanged; next check in {interval:.0f}s")
+
+    def next_delay(self, now=None):
+        """Seconds until the next sheet is due, never less than ``min_interval``; None if nothing was probed."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if not self._next_due:
+                return None
+            earliest = min(self._next_due.values())
+        return max(earliest - now, self.min_interval)
+
+    def reset(self):
+        """Makes every sheet due again, e.g. after another job wrote to the sheets."""
+        with self._lock:
+            sheet_names = list(self._intervals)
+            self._intervals.clear()
+            self._next_due.clear()
+        for sheet_name in sheet_names:
+            poll_interval_seconds.set(self.min_interval, sheet=sheet_name)
+
+_gate = None
+_gate_lock = threading.Lock()
+
+def get_change_gate():
+    global _gate
+    with _gate_lock:
+        if _gate is None:
+            _gate = ChangeGate()
+        return _gate
@@ -0,0 +1,124 @@
+import logging
+import re
+from api.config import EMAIL_COLUMN, MOVE_AND_REMOVE_SHEETS_TO_CHECK, PROCESSOR_SHEET_NAME
+from .domain_routing import get_domain_router, get_email_domain
+from .email_index import PENDING_ROW, email_key
+from .metrics import rows_total, stage
+from .sheet_cursor import read_new_emails
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$')
+
+def is_valid_email(email):
+    """Validates an email address using a regex."""
+    return EMAIL_REGEX.match(email) is not None
+
+class DedupEngine:
+    """Routes new PROCESSOR rows to their provider sheets and removes duplicate or invalid rows.
+
+    Duplicates are detected across every sheet in ``sheet_names`` through an EmailIndex;
+    the first indexed copy of an email is kept. A cycle only reads and looks up rows added
+    since the previous one, resolves each distinct PROCESSOR domain once, appends routed
+    rows with one write per destination sheet and deletes everything in one grouped deletion.
+    """
+
+    def __init__(self, store, index, router=None, sheet_names=MOVE_AND_REMOVE_SHEETS_TO_CHECK,
+                 processor=PROCESSOR_SHEET_NAME):
+        self.store = store
+        self.index = index
+        self.router = router or get_domain_router()
+        self.sheet_names = list(sheet_names)
+        self.processor = processor
+
+    async def run(self):
+        """Runs one cycle: blocking sheet/index work on the sheet I/O pool, DNS on the event loop."""
+        with stage('dedup_scan'):
+            plan = await self.store.run(self._scan)
+        domains = {get_email_domain(email) for _, email in plan["candidates"]}
+        with stage('dedup_route'):
+            destinations = await self.router.route_domains(domains) if domains else {}
+        with stage('dedup_apply'):
+            return await self.store.run(self._apply, plan, destinations)
+
+    def _scan(self):
+        all_sheets = self.sheet_names + [self.processor]
+        cursors = self.index.load_cursors(all_sheets)
+        indexed_rows = {sheet_name: cursor.processed_rows for sheet_name, cursor in cursors.items()}
+        entries_by_sheet = read_new_emails(self.store.store, all_sheets, cursors=cursors)
+
+        for sheet_name in self.sheet_names:
+            if indexed_rows[sheet_name] > 1 and cursors[sheet_name].processed_rows <= 1:
+                # The sheet changed above its watermark and is being read from the top again
+                logger.info(f"Reindexing sheet {sheet_name}")
+                self.index.drop_sheet(sheet_name)
+
+        new_entries = {sheet_name: frame for sheet_name, frame in entries_by_sheet.items() if frame}
+        emails = {sheet_name: frame.filter(frame.nonblank(EMAIL_COLUMN)) for sheet_name, frame in new_entries.items()}
+        normalized = {sheet_name: frame.normalized(EMAIL_COLUMN) for sheet_name, frame in emails.items()}
+        keys = {sheet_name: [email_key(email) for email in sheet_emails] for sheet_name, sheet_emails in normalized.items()}
+        known = self.index.lookup({key for sheet_keys in keys.values() for key in sheet_keys})
+
+        deletions = {}
+        additions = []
+        candidates = []  # (row_index, email) of PROCESSOR rows to route
+        for sheet_name, frame in emails.items():
+            routing = sheet_name == self.processor
+            for row_index, email, key in zip(frame.row_indices, normalized[sheet_name], keys[sheet_name]):
+                existing = known.get(key)
+                if not is_valid_email(email):
+                    deletions.setdefault(sheet_name, []).append(row_index)
+                elif existing is not None and existing != (sheet_name, PENDING_ROW):
+                    deletions.setdefault(sheet_name, []).append(row_index)
+                elif routing:
+                    candidates.append((row_index, email))
+                    known[key] = (self.processor, row_index)
+                else:
+                    known[key] = (sheet_name, row_index)
+                    additions.append((key, sheet_name, row_index))
+
+        return {"cursors": cursors, "entries": new_entries, "deletions": deletions,
+                "additions": additions, "candidates": candidates}
+
+    def _apply(self, plan, destinations):
+        deletions = plan["deletions"]
+        additions = plan["additions"]
+        routes = {}
+        for row_index, email in plan["candidates"]:
+            destination = destinations[get_email_domain(email)]
+            routes.setdefault(destination, []).append(row_index)
+            deletions.setdefault(self.processor, []).append(row_index)
+            additions.append((email_key(email), destination, PENDING_ROW))
+
+        store = self.store.store
+        if routes:
+            frame = store.read_row_frames({self.processor: [i for indices in routes.values() for i in indices]})[self.processor]
+            for destination, row_indices in routes.items():
+                store.append_rows(destination, frame.take_rows(row_indices).rows())
+                logger.info(f"Moved {len(row_indices)} rows from {self.processor} to {destination}")
+        if deletions:
+            store.delete_rows_in_sheets(deletions)
+
+        self.index.add(additions)
+        for sheet_name, row_indices in deletions.items():
+            self.index.shift_after_deletions(sheet_name, row_indices)
+        cursors = plan["cursors"]
+        for sheet_name, frame in plan["entries"].items():
+            deleted = set(deletions.get(sheet_name, ()))
+            cursor = cursors[sheet_name]
+            if sheet_name == self.processor:
+                cursor.advance(frame.items(EMAIL_COLUMN), deleted)
+                continue
+            kept = [email for row_index, email in frame.items(EMAIL_COLUMN) if row_index not in deleted]
+            if kept:
+                cursor.processed_rows += len(kept)
+                cursor.fingerprint = kept[-1]
+        self.index.save_cursors(cursors)
+
+        duplicates = sum(len(row_indices) for sheet_name, row_indices in deletions.items() if sheet_name != self.processor)
+        routed = sum(len(row_indices) for row_indices in routes.values())
+        logger.info(f"Routed {routed} rows from {self.processor}; removed {duplicates} duplicate or invalid rows")
+        rows_total.inc(routed, outcome='routed')
+        rows_total.inc(duplicates, outcome='duplicate')
+        return {"routed": routed, "deleted": sum(len(row_indices) for row_indices in deletions.values())}
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from api.config import DISPOSABLE_DOMAINS_FILE, PROVIDER_DOMAINS_FILE, DOMAIN_TABLE_RELOAD_INTERVAL
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_VALUE = ''  # key of a node's own value in the suffix index; labels are never empty
+
+class DomainTable:
+    """Domain -> value table loaded from a text file.
+
+    Entries are kept in a dict for exact hits. With ``match_parents`` a domain also matches
+    any of its listed parent domains, through a suffix index of nested dicts keyed by labels
+    in reverse order ('com' -> 'mailinator' -> ...), so a lookup costs one step per label
+    and the most specific listed suffix wins. The file is checked for changes at most every
+    ``reload_interval`` seconds and swapped in without a restart; async callers await
+    refresh() so the (re)load runs on a worker thread instead of the event loop.
+    """
+
+    def __init__(self, path, parse_line, match_parents=True, reload_interval=DOMAIN_TABLE_RELOAD_INTERVAL):
+        self.path = path
+        self.parse_line = parse_line
+        self.match_parents = match_parents
+        self.reload_interval = reload_interval
+        self._tables = ({}, {})
+        self._mtime = None
+        self._next_check = 0.0
+        self._reload_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tables[0])
+
+    def _load(self, mtime):
+        exact = {}
+        index = {}
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                domain, value = self.parse_line(line)
+                domain = domain.lower().strip('.')
+                exact[domain] = value
+                if not self.match_parents:
+                    continue
+                node = index
+                for label in reversed(domain.split('.')):
+                    node = node.setdefault(label, {})
+                node[_VALUE] = value
+        self._tables = (exact, index)  # swapped in one assignment, readers never see a partial table
+        self._mtime = mtime
+        logger.info(f"Loaded {len(exact)} domains from {self.path}")
+
+    def _maybe_reload(self, wait=False):
+        if time.monotonic() < self._next_check or not self._reload_lock.acquire(blocking=wait):
+            return
+        try:
+            now = time.monotonic()
+            if now < self._next_check:  # checked by another thread while this one waited
+                return
+            self._next_check = now + self.reload_interval
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime != self._mtime:
+                self._load(mtime)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load domain table {self.path}: {e}")
+        finally:
+            self._reload_lock.release()
+
+    async def refresh(self):
+        """Loads the table, or reloads it if the file changed, on a worker thread."""
+        if time.monotonic() >= self._next_check:
+            # The first load waits for a concurrent one, so no caller sees an empty table
+            await asyncio.to_thread(self._maybe_reload, self._mtime is None)
+
+    def lookup(self, domain, default=None):
+        """Reloads the table if due, inline, then returns get(domain, default); for sync callers."""
+        self._maybe_reload()
+        return self.get(domain, default)
+
+    def get(self, domain, default=None):
+        """Returns the value of the domain or, with ``match_parents``, of its closest listed parent domain."""
+        exact, index = self._tables
+        value = exact.get(domain)
+        if value is not None:
+            return value
+        found = default
+        node = index
+        for label in reversed(domain.split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get(_VALUE, found)
+        return found
+
+def _parse_disposable(line):
+    return line.split()[0], True
+
+def _parse_provider(line):
+    domain, sheet = line.split()[:2]
+    return domain, sheet
+
+disposable_domains = DomainTable(DISPOSABLE_DOMAINS_FILE, _parse_disposable)
+# Provider routing is exact: a subdomain of a listed provider is not that provider's mailbox
+provider_domains = DomainTable(PROVIDER_DOMAINS_FILE, _parse_provider, match_parents=False)
+
+def is_disposable_domain(domain):
+    return disposable_domains.lookup(domain, False)
+
+async def get_provider_sheet(domain):
+    """Returns the sheet of a known email provider domain, or None."""
+    await provider_domains.refresh()
+    return provider_domains.get(domain)
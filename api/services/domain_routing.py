@@ -0,0 +1,122 @@
+import asyncio
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+import logging
+from cachetools import TLRUCache
+from .domain_classifier import get_provider_sheet, provider_domains
+from api.config import MX_CACHE_SIZE, MX_MIN_TTL, MX_MAX_TTL, MX_NEGATIVE_TTL, MX_MAX_CONCURRENCY, MX_TIMEOUT
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def get_email_domain(email):
+    """Extracts the domain from an email address."""
+    return email.split('@')[-1].lower()
+
+def _expires(key, value, now):
+    # Cached values are (result, ttl) pairs; each entry expires after its own TTL
+    return now + value[1]
+
+class MXResolver:
+    """Async MX lookups with an LRU cache that honours record TTLs.
+
+    NXDOMAIN and no-MX answers are cached for MX_NEGATIVE_TTL; timeouts are not cached.
+    Concurrent lookups of the same domain share one query, and at most ``concurrency``
+    queries are in flight at once.
+    """
+
+    def __init__(self, maxsize=MX_CACHE_SIZE, concurrency=MX_MAX_CONCURRENCY, timeout=MX_TIMEOUT):
+        self._cache = TLRUCache(maxsize=maxsize, ttu=_expires)
+        self._inflight = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._resolver = dns.asyncresolver.Resolver()
+        self._resolver.lifetime = timeout
+        self.stats = {"hits": 0, "coalesced": 0, "queries": 0, "negative": 0, "errors": 0}
+
+    async def get_mx_records(self, domain):
+        """Fetches the MX hosts of a domain, from cache when possible."""
+        mx_records, _ = await self.lookup(domain)
+        return mx_records
+
+    async def lookup(self, domain):
+        """Returns (mx_records, ttl); ttl is None when the answer was an error and not cached."""
+        cached = self._cache.get(domain)
+        if cached is not None:
+            self.stats["hits"] += 1
+            return cached
+        task = self._inflight.get(domain)
+        if task is None:
+            task = asyncio.create_task(self._query(domain))
+            self._inflight[domain] = task
+            task.add_done_callback(lambda _: self._inflight.pop(domain, None))
+        else:
+            self.stats["coalesced"] += 1
+        # Shielded so one cancelled caller doesn't cancel the query others are waiting on
+        return await asyncio.shield(task)
+
+    async def _query(self, domain):
+        async with self._semaphore:
+            self.stats["queries"] += 1
+            try:
+                answer = await self._resolver.resolve(domain, 'MX')
+                mx_records = [r.exchange.to_text() for r in answer]
+                ttl = min(max(answer.rrset.ttl, MX_MIN_TTL), MX_MAX_TTL)
+                logger.debug(f"MX records for domain {domain}: {mx_records}")
+            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN) as e:
+                self.stats["negative"] += 1
+                logger.debug(f"No MX records for domain {domain}: {str(e)}")
+                mx_records, ttl = [], MX_NEGATIVE_TTL
+            except dns.exception.DNSException as e:
+                self.stats["errors"] += 1
+                logger.warning(f"Could not fetch MX records for domain {domain}: {str(e)}")
+                return [], None
+        self._cache[domain] = (mx_records, ttl)
+        return mx_records, ttl
+
+class DomainRouter:
+    """Memoizes domain -> sheet decisions; an MX-based decision lives as long as its MX record."""
+
+    def __init__(self, resolver=None, maxsize=MX_CACHE_SIZE):
+        self.resolver = resolver or MXResolver()
+        self._decisions = TLRUCache(maxsize=maxsize, ttu=_expires)
+
+    async def get_destination_sheet_name(self, domain):
+        """Maps an email domain to the corresponding sheet name or performs an MX lookup."""
+        # Check if domain matches any predefined sheets
+        provider_sheet = await get_provider_sheet(domain)
+        if provider_sheet is not None:
+            return provider_sheet
+        decided = self._decisions.get(domain)
+        if decided is not None:
+            return decided[0]
+
+        # If no match, check the MX record for the domain
+        mx_records, ttl = await self.resolver.lookup(domain)
+        destination = "PREMIUM"  # Default if no specific sheet or MX record match
+        for mx in mx_records:
+            if "google" in mx or "gmail" in mx:
+                destination = "GSUITE"
+                break
+            elif "outlook" in mx:
+                destination = "OFFICE"
+                break
+        logger.debug(f"Domain {domain} routed to {destination}")
+        if ttl is not None:
+            self._decisions[domain] = (destination, ttl)
+        return destination
+
+    async def route_domains(self, domains):
+        """Resolves the destination sheet of each distinct domain concurrently; returns {domain: sheet}."""
+        domains = list(set(domains))
+        await provider_domains.refresh()  # load the provider table once, before the lookups fan out
+        destinations = await asyncio.gather(*(self.get_destination_sheet_name(domain) for domain in domains))
+        return dict(zip(domains, destinations))
+
+_router = None
+
+def get_domain_router():
+    global _router
+    if _router is None:
+        _router = DomainRouter()
+    return _router
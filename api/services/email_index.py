@@ -0,0 +1,167 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from api.config import EMAIL_INDEX_PATH
+from .row_deletion import coalesce_row_ranges
+from .sheet_cursor import SheetCursor
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PENDING_ROW = -1  # appended to a sheet, position not known until that sheet is scanned
+
+def normalize_email(email):
+    return email.strip().lower()
+
+def email_key(email):
+    """Returns a 64-bit key for a normalized email, which keeps the index compact."""
+    return int.from_bytes(hashlib.blake2b(email.encode('utf-8'), digest_size=8).digest(), 'big', signed=True)
+
+class EmailIndex:
+    """Persistent map of normalized email -> (sheet, row index) across the routed sheets.
+
+    It also stores a SheetCursor per sheet, recording how far that sheet has been indexed,
+    so each cycle only has to read and look up the rows added since the last one.
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS emails (
+                email_key INTEGER PRIMARY KEY,
+                sheet TEXT NOT NULL,
+                row_index INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS emails_by_row ON emails (sheet, row_index);
+            CREATE TABLE IF NOT EXISTS scan_state (
+                sheet TEXT PRIMARY KEY,
+                header TEXT NOT NULL,
+                processed_rows INTEGER NOT NULL,
+                fingerprint TEXT
+            );
+        ''')
+        self._conn.commit()
+
+    def load_cursors(self, sheet_names):
+        cursors = {sheet_name: SheetCursor() for sheet_name in sheet_names}
+        with self._lock:
+            rows = self._conn.execute('SELECT sheet, header, processed_rows, fingerprint FROM scan_state').fetchall()
+        for sheet_name, header, processed_rows, fingerprint in rows:
+            cursor = cursors.get(sheet_name)
+            if cursor is None or not cursor.set_header(json.loads(header)):
+                continue
+            cursor.processed_rows = processed_rows
+            cursor.fingerprint = fingerprint
+        return cursors
+
+    def save_cursors(self, cursors):
+        with self._lock:
+            for sheet_name, cursor in cursors.items():
+                if cursor.header is None:
+                    self._conn.execute('DELETE FROM scan_state WHERE sheet = ?', (sheet_name,))
+                    continue
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO scan_state (sheet, header, processed_rows, fingerprint) VALUES (?, ?, ?, ?)',
+                    (sheet_name, json.dumps(cursor.header), cursor.processed_rows, cursor.fingerprint))
+            self._conn.commit()
+
+    def lookup(self, keys):
+        """Returns {key: (sheet, row_index)} for the keys already indexed."""
+        found = {}
+        keys = list(keys)
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for key, sheet_name, row_index in self._conn.execute(
+                        f'SELECT email_key, sheet, row_index FROM emails WHERE email_key IN ({placeholders})', chunk):
+                    found[key] = (sheet_name, row_index)
+        return found
+
+    def add(self, entries):
+        """Indexes (key, sheet, row_index) entries, replacing earlier positions of the same keys."""
+        with self._lock:
+            self._conn.executemany('INSERT OR REPLACE INTO emails (email_key, sheet, row_index) VALUES (?, ?, ?)',
+                                   entries)
+            self._conn.commit()
+
+    def drop_sheet(self, sheet_name):
+        """Forgets a sheet's entries before it is rescanned from the top."""
+        with self._lock:
+            self._conn.execute('DELETE FROM emails WHERE sheet = ?', (sheet_name,))
+            self._conn.commit()
+
+    def shift_after_deletions(self, sheet_name, row_indices):
+        """Moves indexed rows of a sheet up past rows that were deleted from it."""
+        with self._lock:
+            # Ranges come highest first, so every shifted row stays above the next range
+            for start, end in coalesce_row_ranges(row_indices):
+                self._conn.execute('UPDATE emails SET row_index = row_index - ? WHERE sheet = ? AND row_index >= ?',
+                                   (end - start, sheet_name, end))
+            self._conn.commit()
+
+    def record_moves(self, destination, entries):
+        """Keeps the index and scan cursors in step with rows another job moved or deleted.
+
+        ``entries`` are [sheet_name, row_index, email, moved] lists of rows deleted from their
+        sheet. A moved email is re-keyed to ``destination`` as PENDING_ROW, so its new copy is
+        accepted when that sheet is scanned; a deleted one is forgotten. Only entries still
+        placing the email at that row, or pending in that sheet, are touched. Rows and scan
+        watermarks below the deleted rows shift up, so the next cycle stays incremental.
+
+        Returns {sheet: A1 cell} for cursors whose last settled row was deleted; the cell now
+        at that position must be read and passed to set_fingerprints().
+        """
+        deleted_rows = {}
+        moved = []
+        forgotten = []
+        for sheet_name, row_index, email, move in entries:
+            deleted_rows.setdefault(sheet_name, set()).add(row_index)
+            match = (email_key(normalize_email(email)), sheet_name, row_index, PENDING_ROW)
+            if move:
+                moved.append((destination, PENDING_ROW) + match)
+            else:
+                forgotten.append(match)
+        with self._lock:
+            self._conn.executemany('UPDATE emails SET sheet = ?, row_index = ? '
+                                   'WHERE email_key = ? AND sheet = ? AND row_index IN (?, ?)', moved)
+            self._conn.executemany('DELETE FROM emails WHERE email_key = ? AND sheet = ? AND row_index IN (?, ?)',
+                                   forgotten)
+            self._conn.commit()
+        for sheet_name, row_indices in deleted_rows.items():
+            self.shift_after_deletions(sheet_name, row_indices)
+
+        cursors = {sheet_name: cursor for sheet_name, cursor in self.load_cursors(deleted_rows).items()
+                   if cursor.header is not None}
+        stale = {}
+        for sheet_name, cursor in cursors.items():
+            row_indices = deleted_rows[sheet_name]
+            last_settled = cursor.processed_rows - 1
+            cursor.processed_rows -= sum(1 for row_index in row_indices if row_index < cursor.processed_rows)
+            if last_settled in row_indices:
+                stale[sheet_name] = f"{cursor.email_column}{cursor.processed_rows}"
+        self.save_cursors(cursors)
+        return stale
+
+    def set_fingerprints(self, fingerprints):
+        """Stores the email cell now closing each given sheet's scanned rows."""
+        cursors = self.load_cursors(fingerprints)
+        for sheet_name, fingerprint in fingerprints.items():
+            cursors[sheet_name].fingerprint = fingerprint
+        self.save_cursors({sheet_name: cursor for sheet_name, cursor in cursors.items() if cursor.header is not None})
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_email_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            path = EMAIL_INDEX_PATH or os.path.join(tempfile.gettempdir(), 'nextjs-fastapi-email-index.db')
+            _index = EmailIndex(path)
+        return _index
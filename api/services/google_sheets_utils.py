@@ -1,6 +1,11 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 import logging
+import threading
+import time
+from api.config import SHEETS_API_ENDPOINT
+from .metrics import sheets_call_seconds, sheets_calls_total
+from .quota import error_status, governor
+from .row_deletion import merge_batches, plan_row_deletions
+from .sheets_discovery import load_discovery_document
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -8,214 +13,178 @@ logger = logging.getLogger(__name__)
 # Google Sheets and API configuration
 SPREADSHEET_ID = '1y7_yT1OEdkTEeEEk_JCLbAEtPAVH9RKTXiQclkE6ugU'
 SERVICE_ACCOUNT_FILE = 'api/credentials.json'
-EMAIL_COLUMN_INDEX = 18  # 19th column, 0-based index
-VERIFIED_SHEET_NAME = 'VERIFIED'
-SHEETS_TO_CHECK = ["OFFICE", "GMAIL", "AOL", "OUTLOOK", "HOTMAIL"]
-MOVE_AND_REMOVE_SHEETS_TO_CHECK = ["VERIFIED", "GMAIL", "OUTLOOK", "HOTMAIL", "AOL", "EARTHLINK", "MAIL", "COX", "YAHOO", "PREMIUM"]
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+HTTP_TIMEOUT = 60  # seconds per Sheets API request
+SHEET_METADATA_TTL = 300  # seconds before cached sheet properties are refetched
+MAX_RANGES_PER_BATCH_GET = 100  # ranges per values.batchGet call, keeps the request URL short
+
+# Process-wide client state, built lazily on first use. The Google client libraries are
+# imported there too, so a cold start that never touches a sheet does not pay for them
+_client_lock = threading.RLock()
+_credentials = None
+_service = None
+_http_local = threading.local()
+
+# Sheet title -> properties (sheetId, gridProperties, ...)
+_metadata_lock = threading.Lock()
+_sheet_properties = {}
+_sheet_properties_fetched_at = None
+
+def get_credentials():
+    """Loads the service account credentials once so the OAuth token is reused across calls."""
+    global _credentials
+    with _client_lock:
+        if _credentials is None and SHEETS_API_ENDPOINT:
+            from google.auth.credentials import AnonymousCredentials
+            _credentials = AnonymousCredentials()
+        elif _credentials is None:
+            from google.oauth2 import service_account
+            _credentials = service_account.Credentials.from_service_account_file(
+                SERVICE_ACCOUNT_FILE, scopes=SCOPES)
+        return _credentials
+
+def _get_authorized_http():
+    """Returns this thread's keep-alive HTTP connection, authorized with the shared credentials."""
+    http = getattr(_http_local, 'http', None)
+    if http is None:
+        import google_auth_httplib2
+        import httplib2
+        http = google_auth_httplib2.AuthorizedHttp(
+            get_credentials(), http=httplib2.Http(timeout=HTTP_TIMEOUT))
+        _http_local.http = http
+    return http
+
+def _build_request(http, *args, **kwargs):
+    # httplib2 connections are not thread-safe, so every request runs on its thread's own connection
+    from googleapiclient.http import HttpRequest
+    return HttpRequest(_get_authorized_http(), *args, **kwargs)
 
 def get_sheets_service():
-    credentials = service_account.Credentials.from_service_account_file(
-        SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-    service = build('sheets', 'v4', credentials=credentials)
-    return service
+    """Returns the shared Sheets client, built once per process from the bundled discovery document."""
+    global _service
+    with _client_lock:
+        if _service is None:
+            from googleapiclient.discovery import build_from_document
+            client_options = {'api_endpoint': SHEETS_API_ENDPOINT} if SHEETS_API_ENDPOINT else None
+            _service = build_from_document(load_discovery_document(), http=_get_authorized_http(),
+                                           requestBuilder=_build_request, client_options=client_options)
+        return _service
+
+def _execute(request, kind='read'):
+    # Every Sheets call goes through the quota governor for rate limiting and retries
+    method = getattr(request, 'methodId', None) or 'unknown'
+    status = 200
+    try:
+        with sheets_call_seconds.time(method=method):
+            return governor.execute(request.execute, kind)
+    except Exception as e:
+        status = error_status(e) or 'error'
+        raise
+    finally:
+        sheets_calls_total.inc(method=method, status=status)
 
-def get_sheet_id(sheet_name):
+def _fetch_sheet_properties():
     service = get_sheets_service()
-    spreadsheet = service.spreadsheets().get(spreadsheetId=SPREADSHEET_ID).execute()
-    sheets = spreadsheet.get('sheets', [])
-    for sheet in sheets:
-        if sheet['properties']['title'] == sheet_name:
-            return sheet['properties']['sheetId']
-    return None
-
-def get_sheet_data(sheet_name):
+    spreadsheet = _execute(service.spreadsheets().get(spreadsheetId=SPREADSHEET_ID,
+                                                      fields='sheets.properties'))
+    return {sheet['properties']['title']: sheet['properties'] for sheet in spreadsheet.get('sheets', [])}
+
+def get_sheet_properties(sheet_name):
+    """Returns the cached properties of a sheet, refetching the spreadsheet metadata once it is stale."""
+    global _sheet_properties, _sheet_properties_fetched_at
+    with _metadata_lock:
+        now = time.monotonic()
+        stale = _sheet_properties_fetched_at is None or now - _sheet_properties_fetched_at > SHEET_METADATA_TTL
+        if stale or sheet_name not in _sheet_properties:
+            _sheet_properties = _fetch_sheet_properties()
+            _sheet_properties_fetched_at = now
+            logger.debug(f"Refreshed metadata for {len(_sheet_properties)} sheets")
+        return _sheet_properties.get(sheet_name)
+
+def invalidate_sheet_metadata():
+    """Forces the next metadata lookup to refetch the spreadsheet properties."""
+    global _sheet_properties_fetched_at
+    with _metadata_lock:
+        _sheet_properties_fetched_at = None
+
+def _adjust_row_count(sheet_name, delta):
+    # Keep the cached grid size in step with our own inserts/deletes instead of refetching it
+    with _metadata_lock:
+        properties = _sheet_properties.get(sheet_name)
+        if properties is not None:
+            grid = properties.setdefault('gridProperties', {})
+            grid['rowCount'] = max(grid.get('rowCount', 0) + delta, 0)
+
+def get_sheet_id(sheet_name):
+    properties = get_sheet_properties(sheet_name)
+    return properties['sheetId'] if properties else None
+
+def get_sheet_data(sheet_name, cell_range="A:Z"):
     service = get_sheets_service()
     sheet = service.spreadsheets()
-    result = sheet.values().get(spreadsheetId=SPREADSHEET_ID,
-                                range=f"{sheet_name}!A:Z").execute()
+    result = _execute(sheet.values().get(spreadsheetId=SPREADSHEET_ID,
+                                         range=f"{sheet_name}!{cell_range}"))
     return result.get('values', [])
 
 def update_sheet_data(sheet_name, values):
     service = get_sheets_service()
     body = {'values': values}
-    result = service.spreadsheets().values().append(
+    result = _execute(service.spreadsheets().values().append(
         spreadsheetId=SPREADSHEET_ID, range=f"{sheet_name}!A1",
-        valueInputOption='RAW', insertDataOption='INSERT_ROWS', body=body).execute()
+        valueInputOption='RAW', insertDataOption='INSERT_ROWS', body=body), 'write')
+    _adjust_row_count(sheet_name, len(values))
     return result
 
-def delete_sheet_rows(sheet_name, row_indices):
+def batch_get_sheet_data(ranges):
+    """Reads several A1 ranges ('GMAIL!S2:S') with as few values.batchGet calls as possible.
+
+    Returns one values list per requested range, in request order.
+    """
+    service = get_sheets_service()
+    results = []
+    for i in range(0, len(ranges), MAX_RANGES_PER_BATCH_GET):
+        response = _execute(service.spreadsheets().values().batchGet(
+            spreadsheetId=SPREADSHEET_ID, ranges=ranges[i:i + MAX_RANGES_PER_BATCH_GET]))
+        results.extend(value_range.get('values', []) for value_range in response.get('valueRanges', []))
+    return results
+
+def delete_rows_in_sheets(deletions):
+    """Deletes rows from several sheets in as few batchUpdate calls as possible.
+
+    ``deletions`` maps a sheet name to the 0-based indices of the rows to delete.
+    """
     try:
         service = get_sheets_service()
-        sheet_id = get_sheet_id(sheet_name)
-        if sheet_id is None:
-            logger.error(f"Sheet ID not found for sheet: {sheet_name}")
+        plans = []
+        planned = {}
+        for sheet_name, row_indices in deletions.items():
+            properties = get_sheet_properties(sheet_name)
+            if properties is None:
+                logger.error(f"Sheet ID not found for sheet: {sheet_name}")
+                continue
+            total_rows = properties['gridProperties']['rowCount']
+            plan = plan_row_deletions(properties['sheetId'], row_indices, row_count=total_rows)
+            if plan:
+                plans.append(plan)
+                planned[sheet_name] = (len(set(row_indices)), total_rows)
+
+        batches = merge_batches(plans)
+        if not batches:
+            logger.info(f"No rows to delete in {', '.join(deletions)}.")
             return
-        
-        sheet_metadata = service.spreadsheets().get(spreadsheetId=SPREADSHEET_ID).execute()
-        sheet_info = next(sheet for sheet in sheet_metadata['sheets'] if sheet['properties']['title'] == sheet_name)
-        total_rows = sheet_info['properties']['gridProperties']['rowCount']
-        
-        # If all rows are to be deleted, first insert an empty row
-        if len(row_indices) >= total_rows - 1:
-            # Insert an empty row at the end of the sheet (valid index range)
-            insert_row_request = {
-                "insertDimension": {
-                    "range": {
-                        "sheetId": sheet_id,
-                        "dimension": "ROWS",
-                        "startIndex": total_rows - 1,  # Insert at the last valid index
-                        "endIndex": total_rows
-                    }
-                }
-            }
-            service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body={"requests": [insert_row_request]}).execute()
-            logger.info(f"Inserted an empty row at the end of {sheet_name} before deletion.")
-        
-        # Proceed to delete the specified rows
-        requests = [{"deleteDimension": {"range": {
-            "sheetId": sheet_id, "dimension": "ROWS", "startIndex": idx, "endIndex": idx + 1}}} for idx in row_indices]
-        
-        if requests:
-            batch_update_request = {"requests": requests}
-            service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=batch_update_request).execute()
-            logger.info(f"Deleted {len(row_indices)} rows from {sheet_name}.")
-        else:
-            logger.info(f"No rows to delete in {sheet_name}.")
-            
+
+        for body in batches:
+            _execute(service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body=body), 'write')
+        for sheet_name, (deleted, total_rows) in planned.items():
+            # Clearing every data row keeps one emptied row behind, so the grid never drops below header + 1
+            _adjust_row_count(sheet_name, -min(deleted, total_rows - 2))
+            logger.info(f"Deleted {deleted} rows from {sheet_name}.")
+        logger.info(f"Applied deletions to {len(planned)} sheet(s) in {len(batches)} batch request(s).")
+
     except Exception as e:
-        logger.error(f"Error deleting rows from sheet {sheet_name}: {str(e)}")
-
-# def get_email_domain(email):
-#     """Extracts the domain from an email address."""
-#     return email.split('@')[-1].lower()
-
-# def get_mx_record(domain):
-#     """Fetches the MX record for a given domain."""
-#     try:
-#         answers = dns.resolver.resolve(domain, 'MX')
-#         mx_records = [r.exchange.to_text() for r in answers]
-#         logger.debug(f"MX records for domain {domain}: {mx_records}")
-#         return mx_records
-#     except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.Timeout) as e:
-#         logger.warning(f"Could not fetch MX records for domain {domain}: {str(e)}")
-#         return []
-
-# def get_destination_sheet_name(domain):
-#     """Maps an email domain to the corresponding sheet name or performs an MX lookup."""
-#     domain_to_sheet = {
-#         "gmail.com": "GMAIL",
-#         "aol.com": "AOL",
-#         "outlook.com": "OUTLOOK",
-#         "hotmail.com": "HOTMAIL",
-#         "earthlink.net": "EARTHLINK",
-#         "mail.com": "MAIL",
-#         "cox.net": "COX",
-#         "yahoo.com": "YAHOO",
-#     }
-    
-#     # Check if domain matches any predefined sheets
-#     if domain in domain_to_sheet:
-#         logger.debug(f"Domain {domain} mapped directly to sheet {domain_to_sheet[domain]}")
-#         return domain_to_sheet[domain]
-    
-#     # If no match, check the MX record for the domain
-#     mx_records = get_mx_record(domain)
-#     for mx in mx_records:
-#         if "google" in mx or "gmail" in mx:
-#             logger.debug(f"Domain {domain} has MX record {mx}, sending to GSUITE")
-#             return "GSUITE"
-#         elif "outlook" in mx:
-#             logger.debug(f"Domain {domain} has MX record {mx}, sending to OFFICE")
-#             return "OFFICE"
-    
-#     # Default to PREMIUM if no specific sheet or MX record match
-#     logger.debug(f"Domain {domain} does not match any predefined sheets or MX records, sending to PREMIUM")
-#     return "PREMIUM"
-
-# def append_row_to_sheet(sheet_name, row_data):
-#     """Appends a row to a specific sheet."""
-#     update_sheet_data(sheet_name, [row_data])
-
-# def delete_sheet_row(sheet_name, row_index):
-#     """Deletes a specific row from a sheet."""
-#     delete_sheet_rows(sheet_name, [row_index])
-
-# def move_rows_based_on_email():
-#     """Moves rows from the PROCESSOR sheet to the appropriate sheet based on email domain and MX records."""
-#     data = get_sheet_data("PROCESSOR")
-#     if len(data) < 2:
-#         logger.info("No data to process or only header found in PROCESSOR sheet.")
-#         return
-    
-#     header = data[0]
-#     rows_to_delete = []
-    
-#     for i, row in enumerate(data[1:], start=1):  # Start from the second row (index 1)
-#         if len(row) > EMAIL_COLUMN_INDEX:
-#             email = row[EMAIL_COLUMN_INDEX].strip()
-#             domain = get_email_domain(email)
-#             destination_sheet = get_destination_sheet_name(domain)
-            
-#             if destination_sheet:
-#                 logger.info(f"Moving email {email} to sheet {destination_sheet}")
-#                 append_row_to_sheet(destination_sheet, row)
-#                 rows_to_delete.append(i)
-    
-#     if rows_to_delete:
-#         delete_sheet_rows("PROCESSOR", sorted(rows_to_delete, reverse=True))
-
-# def is_valid_email(email):
-#     """Validates an email address using a regex."""
-#     email_regex = r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
-#     return re.match(email_regex, email) is not None
-
-# def remove_duplicate_rows():
-#     """Removes duplicate or invalid email rows from specified sheets in a single batch request."""
-#     service = get_sheets_service()
-    
-#     for sheet_name in MOVE_AND_REMOVE_SHEETS_TO_CHECK:
-#         sheet_data = get_sheet_data(sheet_name)
-#         if len(sheet_data) <= 1:
-#             # Either no data or only header row, no duplicates to remove
-#             logger.info(f"No data or only header row in sheet: {sheet_name}. Skipping deletion.")
-#             continue
-
-#         seen = set()
-#         rows_to_delete = []
-
-#         for i, row in enumerate(sheet_data[1:], start=1):  # Adjust index to account for zero-based indexing
-#             if len(row) > EMAIL_COLUMN_INDEX:
-#                 email = row[EMAIL_COLUMN_INDEX].strip().lower()
-
-#                 if not is_valid_email(email) or email in seen:
-#                     rows_to_delete.append(i)
-#                 else:
-#                     seen.add(email)
-        
-#         if len(sheet_data) - len(rows_to_delete) == 1:
-#             logger.info(f"Only the header row would remain in sheet: {sheet_name}. Proceeding with deletion of all data rows.")
-#         elif len(rows_to_delete) == 0:
-#             logger.info(f"No duplicates found in sheet: {sheet_name}. Skipping deletion.")
-#             continue
-
-#         # Construct a single batch request to delete all identified rows
-#         requests = [{
-#             'deleteDimension': {
-#                 'range': {
-#                     'sheetId': get_sheet_id(sheet_name),
-#                     'dimension': 'ROWS',
-#                     'startIndex': row_index,
-#                     'endIndex': row_index + 1
-#                 }
-#             }
-#         } for row_index in sorted(rows_to_delete, reverse=True)]
-
-#         if requests:
-#             try:
-#                 service.spreadsheets().batchUpdate(spreadsheetId=SPREADSHEET_ID, body={'requests': requests}).execute()
-#                 logger.info(f"Deleted {len(rows_to_delete)} duplicate rows from {sheet_name} in a single batch request.")
-#             except Exception as e:
-#                 logger.error(f"Error deleting rows in batch from sheet {sheet_name}: {str(e)}")
-#         else:
-#             logger.info(f"No rows to delete in {sheet_name}.")
+        invalidate_sheet_metadata()
+        logger.error(f"Error deleting rows from sheets {', '.join(deletions)}: {str(e)}")
+        raise
+
+def delete_sheet_rows(sheet_name, row_indices):
+    delete_rows_in_sheets({sheet_name: row_indices})
@@ -0,0 +1,33 @@
+import asyncio
+import logging
+import httpx
+from api.config import HTTP_CLIENT_TIMEOUT, HTTP_MAX_CONNECTIONS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_loop = None
+
+def get_http_client():
+    """Returns the process-wide AsyncClient, so outbound calls reuse pooled keep-alive connections.
+
+    The client is created on first use inside the running event loop and closed by
+    close_http_client() at shutdown; a call from another event loop gets a fresh client.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_CLIENT_TIMEOUT),
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS))
+        _client_loop = loop
+        logger.info("Created shared HTTP client")
+    return _client
+
+async def close_http_client():
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _client_loop = None
@@ -0,0 +1,69 @@
+import json
+import logging
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # falls back to the stdlib encoder
+    orjson = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def dumps(content):
+    """Serializes to compact JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def loads(body):
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+class FastJSONResponse(JSONResponse):
+    """Default response class of the app: JSONResponse rendered with orjson."""
+
+    def render(self, content):
+        return dumps(content)
+
+class ModelResponse(FastJSONResponse):
+    """Response for an already-validated pydantic model, skipping jsonable_encoder.
+
+    FastAPI passes a returned Response through untouched, so the model is dumped straight
+    to bytes instead of being re-encoded field by field.
+    """
+
+    def __init__(self, model, status_code=200, **kwargs):
+        super().__init__(model.dict(), status_code=status_code, **kwargs)
+
+class PrebuiltJSONResponse(Response):
+    """Response whose JSON body was serialized once, for endpoints with a constant payload."""
+
+    media_type = "application/json"
+
+    def __init__(self, body, status_code=200, **kwargs):
+        super().__init__(body, status_code=status_code, **kwargs)
+
+def prebuilt(content):
+    """Serializes a constant payload once; returns the body for PrebuiltJSONResponse."""
+    return dumps(content)
+
+class FastJSONRequest(Request):
+    async def json(self):
+        if not hasattr(self, "_json"):
+            self._json = loads(await self.body())
+        return self._json
+
+class FastJSONRoute(APIRoute):
+    """Route class that parses JSON request bodies with orjson before pydantic validation."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def fast_json_handler(request):
+            return await handler(FastJSONRequest(request.scope, request.receive))
+
+        return fast_json_handler
@@ -0,0 +1,163 @@
+import asyncio
+import bisect
+import contextlib
+import logging
+import threading
+import time
+from api.config import EVENT_LOOP_LAG_INTERVAL
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4'  # PlainTextResponse appends the charset
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}"]
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        """Observes the wall time of the block, in sync or async code alike."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _render_sample(self, key, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, [('le', bound)])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {total}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        """Returns every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+registry = Registry()
+
+stage_seconds = registry.register(Histogram(
+    'pipeline_stage_seconds', 'Wall time of each stage of the verification and dedup pipelines.', ['stage']))
+rows_total = registry.register(Counter(
+    'pipeline_rows_total', 'Rows handled by the pipelines, by outcome.', ['outcome']))
+verify_requests_total = registry.register(Counter(
+    'verify_requests_total', 'Outbound email verification requests, by result.', ['result']))
+sheets_calls_total = registry.register(Counter(
+    'sheets_api_calls_total', 'Sheets API calls, by method and HTTP status.', ['method', 'status']))
+sheets_call_seconds = registry.register(Histogram(
+    'sheets_api_call_seconds', 'Sheets API call latency including quota waits and retries.', ['method']))
+job_runs_total = registry.register(Counter(
+    'job_runs_total', 'Background job runs, by result.', ['job', 'result']))
+job_seconds = registry.register(Histogram(
+    'job_duration_seconds', 'Wall time of background job runs.', ['job']))
+change_probes_total = registry.register(Counter(
+    'verify_change_probes_total', 'Per-sheet change checks of the verification job, by result.', ['result']))
+poll_interval_seconds = registry.register(Gauge(
+    'verify_poll_interval_seconds', 'Current adaptive poll interval of each verified sheet.', ['sheet']))
+event_loop_lag_seconds = registry.register(Histogram(
+    'event_loop_lag_seconds', 'How late the event loop woke up from a timed sleep.', (),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)))
+event_loop_lag_last = registry.register(Gauge(
+    'event_loop_lag_last_seconds', 'Most recent event loop lag sample.'))
+
+def stage(name):
+    """Times a pipeline stage: ``with stage('read_pages'): ...``"""
+    return stage_seconds.time(stage=name)
+
+async def watch_event_loop_lag(interval=EVENT_LOOP_LAG_INTERVAL):
+    """Samples event loop lag until cancelled; anything blocking the loop shows up as lag."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(loop.time() - started - interval, 0.0)
+        event_loop_lag_seconds.observe(lag)
+        event_loop_lag_last.set(lag)
@@ -0,0 +1,94 @@
+import collections
+import contextlib
+import logging
+import os
+import sys
+import threading
+import time
+from api.config import PROFILE_SAMPLE_INTERVAL
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MAX_STACK_DEPTH = 64
+
+def _collapse(frame, thread_name):
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    names.append(thread_name)
+    return ';'.join(reversed(names))
+
+class SamplingProfiler:
+    """Opt-in sampling profiler that covers exactly one run of a chosen job.
+
+    ``arm(job)`` flags the job; its next run is wrapped in ``session(job)``, which samples
+    the stacks of every thread (event loop and sheet I/O pool alike) on a background
+    thread and keeps the result as collapsed stacks, the input format of flame graph tools.
+    Nothing is sampled while no job is armed.
+    """
+
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._armed = set()
+        self._last = None
+
+    def arm(self, job_name):
+        with self._lock:
+            self._armed.add(job_name)
+        logger.info(f"Profiler armed for the next run of {job_name}")
+
+    def armed(self):
+        with self._lock:
+            return sorted(self._armed)
+
+    @contextlib.contextmanager
+    def session(self, job_name):
+        with self._lock:
+            if job_name not in self._armed:
+                armed = False
+            else:
+                self._armed.discard(job_name)
+                armed = True
+        if not armed:
+            yield
+            return
+
+        stacks = collections.Counter()
+        stop = threading.Event()
+        sampler = threading.Thread(target=self._sample, args=(stacks, stop), name='profiler', daemon=True)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            sampler.join()
+            duration = time.perf_counter() - started
+            with self._lock:
+                self._last = {"job": job_name, "duration": duration, "samples": sum(stacks.values()),
+                              "stacks": stacks, "finished": time.time()}
+            logger.info(f"Profiled {job_name}: {sum(stacks.values())} samples over {duration:.1f}s")
+
+    def _sample(self, stacks, stop):
+        own = threading.get_ident()
+        while not stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    stacks[_collapse(frame, names.get(ident, str(ident)))] += 1
+
+    def last_profile(self):
+        """Returns the last profile as collapsed stacks ("frame;frame;... count" lines), or None."""
+        with self._lock:
+            last = self._last
+        if last is None:
+            return None
+        header = (f"# job={last['job']} duration={last['duration']:.3f}s samples={last['samples']} "
+                  f"interval={self.interval}s")
+        return '\n'.join([header] + [f"{stack} {count}" for stack, count in last['stacks'].most_common()]) + '\n'
+
+profiler = SamplingProfiler()
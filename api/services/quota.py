@@ -0,0 +1,170 @@
+import contextlib
+import contextvars
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from api.config import (SHEETS_READ_QUOTA_PER_MINUTE, SHEETS_WRITE_QUOTA_PER_MINUTE, SHEETS_MAX_RETRIES,
+                        SHEETS_RETRY_BASE_DELAY, SHEETS_RETRY_DEADLINE, SHEETS_RETRY_MAX_DELAY)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Lower values are served first when requests queue for the same bucket
+PRIORITY_MOVE = 0  # reads/writes that complete a move already in progress
+PRIORITY_WRITE = 1
+PRIORITY_READ = 2
+
+# Appends and index-based deletions are not idempotent: after a 500/502/504 the write may already have
+# been applied, so those are left to RowMover.resume, which re-checks the rows before deleting
+RETRYABLE_STATUSES = {'read': (429, 500, 502, 503, 504), 'write': (429, 503)}
+
+_priority = contextvars.ContextVar('sheets_request_priority', default=None)
+_deadline = contextvars.ContextVar('sheets_retry_deadline', default=None)
+
+@contextlib.contextmanager
+def request_priority(priority):
+    """Sets the queue priority of the Sheets calls made inside the block (including offloaded ones)."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+@contextlib.contextmanager
+def retry_deadline(deadline):
+    """Stops retrying the Sheets calls made inside the block at ``deadline`` (a time.monotonic value)."""
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+class TokenBucket:
+    """Holds up to ``capacity`` tokens, refilled at ``rate_per_minute``."""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def take(self, now):
+        """Takes a token if one is available; otherwise returns the seconds until one will be."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+def error_status(error):
+    # googleapiclient's HttpError carries the response as .resp; fakes/other clients use .status_code
+    resp = getattr(error, 'resp', None)
+    status = getattr(resp, 'status', None) if resp is not None else getattr(error, 'status_code', None)
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        return None
+
+def _retry_after(error):
+    resp = getattr(error, 'resp', None)
+    try:
+        return float(resp.get('retry-after')) if resp is not None else None
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+class QuotaGovernor:
+    """Rate-limits and retries every Sheets API call of the process.
+
+    Reads and writes draw from separate token buckets sized to the per-minute quotas.
+    Callers waiting on the same bucket are served by priority, then arrival order. Calls
+    failing with 429 or a 5xx are retried with exponential backoff and jitter, honouring
+    Retry-After when the server sends it, until ``max_retries`` or the call's deadline is
+    reached; a retry whose backoff would end past the deadline is not attempted.
+    """
+
+    def __init__(self, read_per_minute=SHEETS_READ_QUOTA_PER_MINUTE, write_per_minute=SHEETS_WRITE_QUOTA_PER_MINUTE,
+                 max_retries=SHEETS_MAX_RETRIES, base_delay=SHEETS_RETRY_BASE_DELAY, max_delay=SHEETS_RETRY_MAX_DELAY,
+                 retry_time=SHEETS_RETRY_DEADLINE):
+        self.buckets = {'read': TokenBucket(read_per_minute), 'write': TokenBucket(write_per_minute)}
+        self.max_retries = max_retries
+        self.retry_time = retry_time
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._cond = threading.Condition()
+        self._waiters = {kind: [] for kind in self.buckets}
+        self._seq = itertools.count()
+        self._stats = {kind: {'calls': 0, 'throttled': 0, 'throttle_seconds': 0.0, 'retried': 0, 'failed': 0}
+                       for kind in self.buckets}
+
+    def acquire(self, kind, priority=PRIORITY_READ):
+        """Blocks until a token of the given kind is granted to this caller."""
+        bucket = self.buckets[kind]
+        waiters = self._waiters[kind]
+        entry = (priority, next(self._seq))
+        started = time.monotonic()
+        throttled = False
+        with self._cond:
+            heapq.heappush(waiters, entry)
+            while True:
+                timeout = None  # not at the head of the queue: wait to be notified
+                if waiters[0] == entry:
+                    timeout = bucket.take(time.monotonic())
+                    if timeout == 0:
+                        heapq.heappop(waiters)
+                        self._cond.notify_all()
+                        break
+                throttled = True
+                self._cond.wait(timeout)
+            stats = self._stats[kind]
+            stats['calls'] += 1
+            if throttled:
+                stats['throttled'] += 1
+                stats['throttle_seconds'] += time.monotonic() - started
+
+    def execute(self, call, kind='read', priority=None, deadline=None):
+        """Runs ``call()`` under the quota, retrying throttled calls (and transient server errors on reads).
+
+        Retries stop at ``deadline`` (a time.monotonic value), by default the one set with
+        retry_deadline, else ``retry_time`` seconds from now.
+        """
+        if priority is None:
+            priority = _priority.get()
+        if priority is None:
+            priority = PRIORITY_READ if kind == 'read' else PRIORITY_WRITE
+        if deadline is None:
+            deadline = _deadline.get()
+        if deadline is None:
+            deadline = time.monotonic() + self.retry_time
+        for attempt in itertools.count():
+            self.acquire(kind, priority)
+            try:
+                return call()
+            except Exception as e:
+                status = error_status(e)
+                delay = min(self.base_delay * 2 ** attempt, self.max_delay)
+                delay = random.uniform(delay / 2, delay)
+                delay = max(delay, _retry_after(e) or 0)
+                if status not in RETRYABLE_STATUSES[kind] or attempt >= self.max_retries:
+                    with self._cond:
+                        self._stats[kind]['failed'] += 1
+                    raise
+                if time.monotonic() + delay > deadline:
+                    logger.warning(f"Sheets {kind} failed with HTTP {status}; not retrying past the call's deadline")
+                    with self._cond:
+                        self._stats[kind]['failed'] += 1
+                    raise
+                with self._cond:
+                    self._stats[kind]['retried'] += 1
+                logger.warning(f"Sheets {kind} failed with HTTP {status}; retry {attempt + 1} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def stats(self):
+        with self._cond:
+            return {kind: dict(stats, queued=len(self._waiters[kind]), tokens=round(self.buckets[kind].tokens, 2))
+                    for kind, stats in self._stats.items()}
+
+governor = QuotaGovernor()
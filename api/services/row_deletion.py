@@ -0,0 +1,60 @@
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MAX_DELETE_REQUESTS_PER_BATCH = 500  # deleteDimension requests sent in a single batchUpdate
+
+def coalesce_row_ranges(row_indices):
+    """Merges 0-based row indices into contiguous [start, end) ranges, highest range first."""
+    ranges = []
+    for idx in sorted(set(row_indices)):
+        if ranges and ranges[-1][1] == idx:
+            ranges[-1][1] = idx + 1
+        else:
+            ranges.append([idx, idx + 1])
+    return [(start, end) for start, end in reversed(ranges)]
+
+def delete_range_request(sheet_id, start, end):
+    return {"deleteDimension": {"range": {
+        "sheetId": sheet_id, "dimension": "ROWS", "startIndex": start, "endIndex": end}}}
+
+def clear_data_rows_requests(sheet_id, row_count, header_rows=1):
+    """Requests that empty a sheet below its header rows in one batchUpdate.
+
+    The API refuses to delete every non-frozen row of a sheet, so one data row is kept
+    and cleared instead of deleted.
+    """
+    if row_count <= header_rows:
+        return []
+    requests = []
+    if row_count > header_rows + 1:
+        requests.append(delete_range_request(sheet_id, header_rows + 1, row_count))
+    requests.append({"updateCells": {
+        "range": {"sheetId": sheet_id, "startRowIndex": header_rows, "endRowIndex": header_rows + 1},
+        "fields": "userEnteredValue"}})
+    return requests
+
+def plan_row_deletions(sheet_id, row_indices, row_count=None, header_rows=1,
+                       max_requests=MAX_DELETE_REQUESTS_PER_BATCH):
+    """Plans the batchUpdate bodies needed to delete the given rows.
+
+    Each batch holds at most ``max_requests`` range deletions, and ranges are emitted in
+    descending order so the batches can be applied one after another without shifting
+    the indices of rows still waiting to be deleted.
+    """
+    ranges = coalesce_row_ranges(row_indices)
+    if not ranges:
+        return []
+    if row_count is not None and ranges == [(header_rows, row_count)]:
+        return [{"requests": clear_data_rows_requests(sheet_id, row_count, header_rows)}]
+    requests = [delete_range_request(sheet_id, start, end) for start, end in ranges]
+    return [{"requests": requests[i:i + max_requests]} for i in range(0, len(requests), max_requests)]
+
+def merge_batches(plans, max_requests=MAX_DELETE_REQUESTS_PER_BATCH):
+    """Packs several sheets' deletion plans into as few batchUpdate bodies as possible.
+
+    Requests keep their per-sheet order, so each sheet's ranges are still applied highest first.
+    """
+    requests = [request for plan in plans for body in plan for request in body["requests"]]
+    return [{"requests": requests[i:i + max_requests]} for i in range(0, len(requests), max_requests)]
@@ -0,0 +1,188 @@
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from api.config import EMAIL_COLUMN, MOVE_JOURNAL_PATH
+from .metrics import rows_total, stage
+from .sheet_store import column_letter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'  # journaled, destination append may or may not have landed
+APPENDED = 'appended'  # destination append landed, source rows not yet deleted
+DONE = 'done'
+
+class MoveJournal:
+    """SQLite write-ahead journal of row-move chunks.
+
+    A chunk is recorded before its rows are appended to the destination and marked as it
+    passes each step, so a restart knows exactly which step of which chunk to finish.
+    Finished chunks are removed, keeping the journal at most one chunk long in practice.
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS move_chunks (
+                chunk_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                destination TEXT NOT NULL,
+                entries TEXT NOT NULL,
+                state TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        ''')
+        self._conn.commit()
+
+    def begin(self, destination, entries):
+        """Records a chunk; ``entries`` are [sheet_name, row_index, email, moved] lists."""
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO move_chunks (destination, entries, state, created_at) VALUES (?, ?, ?, ?)',
+                (destination, json.dumps(entries), PENDING, time.time()))
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def mark(self, chunk_id, state):
+        with self._lock:
+            if state == DONE:
+                self._conn.execute('DELETE FROM move_chunks WHERE chunk_id = ?', (chunk_id,))
+            else:
+                self._conn.execute('UPDATE move_chunks SET state = ? WHERE chunk_id = ?', (state, chunk_id))
+            self._conn.commit()
+
+    def unfinished(self):
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT chunk_id, destination, entries, state FROM move_chunks ORDER BY chunk_id').fetchall()
+        return [(chunk_id, destination, json.loads(entries), state) for chunk_id, destination, entries, state in rows]
+
+_journal = None
+_journal_lock = threading.Lock()
+
+def get_move_journal():
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            path = MOVE_JOURNAL_PATH or os.path.join(tempfile.gettempdir(), 'nextjs-fastapi-move-journal.db')
+            _journal = MoveJournal(path)
+        return _journal
+
+class RowMover:
+    """Moves rows between sheets in journaled chunks: append to the destination, then delete at the source.
+
+    With an ``index`` (the dedup EmailIndex) every deletion is also recorded there, so the
+    index never points at rows that moved away and its scan cursors stay valid.
+    All methods are blocking and meant to run on the sheet I/O pool.
+    """
+
+    def __init__(self, store, journal, destination, index=None):
+        self.store = store
+        self.journal = journal
+        self.destination = destination
+        self.index = index
+
+    def commit(self, processed):
+        """Commits one chunk and returns the number of rows appended to the destination.
+
+        ``processed`` maps source sheet -> [(row_index, email, move)]; every listed row is
+        deleted from its source, and those with ``move`` set are first appended to the
+        destination in sheet then row order.
+        """
+        chunk_entries = [[sheet_name, row_index, email, bool(move)]
+                         for sheet_name, entries in processed.items() for row_index, email, move in sorted(entries)]
+        to_move = {}
+        for sheet_name, row_index, _, move in chunk_entries:
+            if move:
+                to_move.setdefault(sheet_name, []).append(row_index)
+        with stage('read_rows'):
+            frames = self.store.read_row_frames(to_move) if to_move else {}
+        rows = [row for sheet_name, row_indices in to_move.items()
+                for row in frames[sheet_name].take_rows(row_indices).rows()]
+
+        chunk_id = self.journal.begin(self.destination, chunk_entries)
+        if rows:
+            with stage('append'):
+                self.store.append_rows(self.destination, rows)
+        self.journal.mark(chunk_id, APPENDED)
+        with stage('delete'):
+            self.store.delete_rows_in_sheets(
+                {sheet_name: [row_index for row_index, _, _ in entries] for sheet_name, entries in processed.items()})
+        self._record_in_index(chunk_entries)
+        self.journal.mark(chunk_id, DONE)
+        rows_total.inc(len(rows), outcome='moved')
+        rows_total.inc(len(chunk_entries), outcome='deleted')
+        return len(rows)
+
+    def resume(self):
+        """Finishes the chunks a previous process left behind; returns how many were resumed."""
+        chunks = self.journal.unfinished()
+        for chunk_id, destination, entries, state in chunks:
+            if state == PENDING:
+                moved_emails = [email for _, _, email, moved in entries if moved]
+                if moved_emails and not self._append_landed(destination, moved_emails):
+                    # The rows never reached the destination and are still in place at the source
+                    logger.warning(f"Discarding move chunk {chunk_id}: its append to {destination} did not land")
+                    self.journal.mark(chunk_id, DONE)
+                    continue
+                self.journal.mark(chunk_id, APPENDED)
+            deleted = self._delete_unchanged(destination, entries)
+            self.journal.mark(chunk_id, DONE)
+            logger.info(f"Resumed move chunk {chunk_id}: deleted {deleted} source rows")
+        return len(chunks)
+
+    def _email_columns(self, sheet_names):
+        headers = self.store.read_ranges([(sheet_name, 'A1:Z1') for sheet_name in sheet_names])
+        columns = {}
+        for sheet_name, values in zip(sheet_names, headers):
+            header = values[0] if values else []
+            if EMAIL_COLUMN in header:
+                columns[sheet_name] = header.index(EMAIL_COLUMN)
+        return columns
+
+    def _append_landed(self, destination, moved_emails):
+        # Recovery only: the destination's email column is read in full to look for the chunk at its tail
+        column = self._email_columns([destination]).get(destination)
+        if column is None:
+            return False
+        letter = column_letter(column)
+        values = self.store.read_range(destination, f"{letter}2:{letter}")
+        tail = [row[0].strip() for row in values if row and row[0].strip()][-len(moved_emails):]
+        return tail == moved_emails
+
+    def _delete_unchanged(self, destination, entries):
+        # Only delete rows still holding the email we journaled, in case the sheet was edited meanwhile
+        requested = {}
+        for entry in entries:
+            requested.setdefault(entry[0], {})[entry[1]] = entry
+        columns = self._email_columns(list(requested))
+        current = self.store.read_row_frames(
+            {sheet_name: list(rows) for sheet_name, rows in requested.items() if sheet_name in columns})
+        deletions = {}
+        deleted_entries = []
+        for sheet_name, frame in current.items():
+            emails = frame.normalized(columns[sheet_name], lower=False)
+            for row_index, email in zip(frame.row_indices, emails):
+                entry = requested[sheet_name][row_index]
+                if email == entry[2]:
+                    deletions.setdefault(sheet_name, []).append(row_index)
+                    deleted_entries.append(entry)
+        if deletions:
+            self.store.delete_rows_in_sheets(deletions)
+            rows_total.inc(len(deleted_entries), outcome='deleted')
+            self._record_in_index(deleted_entries, destination)
+        return len(deleted_entries)
+
+    def _record_in_index(self, entries, destination=None):
+        if self.index is None or not entries:
+            return
+        stale = self.index.record_moves(destination or self.destination, entries)
+        if stale:
+            # The rows closing some scanned ranges were deleted; fingerprint the rows now in their place
+            values = self.store.read_ranges(list(stale.items()))
+            self.index.set_fingerprints({sheet_name: cells[0][0].strip() if cells and cells[0] else ''
+                                         for sheet_name, cells in zip(stale, values)})
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from api.config import JOB_JITTER, JOB_MAX_BACKOFF, SCHEDULER_LOCK_DIR
+from .metrics import job_runs_total, job_seconds
+from .profiler import profiler
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class LeaderLock:
+    """Non-blocking exclusive lock on a file, held by at most one process on the host.
+
+    The operating system drops the lock when its holder exits, so another worker takes
+    over on its next attempt after a crash.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    @property
+    def held(self):
+        return self._file is not None
+
+    def acquire(self):
+        if self._file is not None:
+            return True
+        lock_file = open(self.path, 'a+')
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+def _timestamp(value):
+    return datetime.fromtimestamp(value, timezone.utc).isoformat() if value else None
+
+class Job:
+    """A coroutine function run every ``interval`` seconds by the worker process holding ``lock``.
+
+    A run that returns a number of seconds sets the delay before the next one instead;
+    the backoff after failures still takes precedence.
+    """
+
+    def __init__(self, name, func, interval, lock, jitter=JOB_JITTER, max_backoff=JOB_MAX_BACKOFF):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.lock = lock
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_started = None
+        self.last_finished = None
+        self.last_duration = None
+        self.last_error = None
+        self.next_run = None
+        self.requested_delay = None
+
+    def _delay(self):
+        if self.consecutive_failures:
+            delay = min(self.interval * 2 ** self.consecutive_failures, self.max_backoff)
+        elif self.requested_delay is not None:
+            delay = self.requested_delay
+        else:
+            delay = self.interval
+        return delay + random.uniform(0, delay * self.jitter)
+
+    async def run_once(self):
+        """Runs the job now unless a run is already in progress; returns whether it ran."""
+        if self.running:
+            logger.warning(f"Job {self.name} is still running; skipping overlapping run")
+            return False
+        self.running = True
+        self.last_started = time.time()
+        started = time.perf_counter()
+        result = 'ok'
+        self.requested_delay = None
+        try:
+            with profiler.session(self.name):
+                delay = await self.func()
+            if isinstance(delay, (int, float)) and not isinstance(delay, bool):
+                self.requested_delay = delay
+            self.consecutive_failures = 0
+            self.last_error = None
+        except Exception as e:
+            result = 'error'
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = str(e)
+            logger.error(f"Job {self.name} failed ({self.consecutive_failures} in a row): {e}")
+        finally:
+            self.runs += 1
+            self.running = False
+            self.last_duration = time.perf_counter() - started
+            self.last_finished = time.time()
+            job_runs_total.inc(job=self.name, result=result)
+            job_seconds.observe(self.last_duration, job=self.name)
+        return True
+
+    async def loop(self):
+        # Stagger the first run so workers started together don't race for the lock in lockstep
+        await asyncio.sleep(random.uniform(0, self.interval * self.jitter))
+        while True:
+            if self.lock.acquire():
+                await self.run_once()
+            delay = self._delay()
+            self.next_run = time.time() + delay
+            await asyncio.sleep(delay)
+
+    def status(self):
+        return {
+            "name": self.name,
+            "leader": self.lock.held,
+            "running": self.running,
+            "interval": self.interval,
+            "requested_delay": self.requested_delay,
+            "runs": self.runs,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_started": _timestamp(self.last_started),
+            "last_finished": _timestamp(self.last_finished),
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+            "next_run": _timestamp(self.next_run),
+        }
+
+class Scheduler:
+    """Runs registered jobs in the background of one FastAPI process.
+
+    Every worker starts the same jobs, but a job only executes in the worker holding its
+    leader lock; the others keep retrying the lock at the job's interval. Jobs registered
+    with the same ``leader_group`` share one lock, so they always run in the same worker.
+    """
+
+    def __init__(self, lock_dir=SCHEDULER_LOCK_DIR):
+        self.lock_dir = lock_dir or tempfile.gettempdir()
+        self.jobs = {}
+        self._locks = {}
+        self._tasks = []
+
+    def add_job(self, name, func, interval, leader_group=None, **kwargs):
+        group = leader_group or name
+        if group not in self._locks:
+            self._locks[group] = LeaderLock(os.path.join(self.lock_dir, f"nextjs-fastapi-{group}.lock"))
+        job = Job(name, func, interval, self._locks[group], **kwargs)
+        self.jobs[name] = job
+        return job
+
+    def start(self):
+        for job in self.jobs.values():
+            self._tasks.append(asyncio.create_task(job.loop(), name=f"job-{job.name}"))
+        logger.info(f"Scheduler started {len(self._tasks)} job(s)")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for lock in self._locks.values():
+            lock.release()
+
+    def status(self):
+        return [job.status() for job in self.jobs.values()]
+
+scheduler = Scheduler()
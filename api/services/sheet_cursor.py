@@ -0,0 +1,143 @@
+import logging
+import threading
+from api.config import EMAIL_COLUMN
+from .sheet_frame import SheetFrame
+from .sheet_store import column_letter
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class SheetCursor:
+    """Remembers the resolved header of a sheet and how many leading rows are already settled.
+
+    ``processed_rows`` counts the header plus the data rows that a previous pass left in
+    place on purpose (e.g. blank emails); ``fingerprint`` is the email cell of the last of
+    those rows and is re-checked on every read to detect edits above the watermark.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.header = None
+        self.email_col_index = None
+        self.processed_rows = 0
+        self.fingerprint = None
+
+    def set_header(self, header):
+        """Adopts a header row; returns False if it has no EMAIL_COLUMN."""
+        if EMAIL_COLUMN not in header:
+            return False
+        self.header = list(header)
+        self.email_col_index = self.header.index(EMAIL_COLUMN)
+        return True
+
+    @property
+    def email_column(self):
+        return column_letter(self.email_col_index)
+
+    def advance(self, entries, settled_indices):
+        """Moves the watermark past the leading entries that were settled by this pass.
+
+        ``entries`` are the (row_index, email) pairs read after the watermark and
+        ``settled_indices`` the rows that were deleted. Blank-email rows stay in the sheet and
+        are stepped over; the watermark stops at the first row that still needs a retry.
+        Returns False once it has stopped, True if every entry was settled.
+        """
+        for row_index, email in entries:
+            if row_index in settled_indices:
+                continue
+            if email:
+                return False
+            self.processed_rows += 1
+            self.fingerprint = email
+        return True
+
+_cursors = {}
+_cursors_lock = threading.Lock()
+
+def get_sheet_cursor(sheet_name):
+    with _cursors_lock:
+        return _cursors.setdefault(sheet_name, SheetCursor())
+
+def _resolve_header(sheet_name, cursor, header_values):
+    if not cursor.set_header(header_values[0] if header_values else []):
+        logger.error(f"No column with header '{EMAIL_COLUMN}' found in sheet: {sheet_name}")
+        return False
+    cursor.processed_rows = 1
+    cursor.fingerprint = EMAIL_COLUMN
+    return True
+
+def _cell(values, offset):
+    row = values[offset] if offset < len(values) else []
+    return row[0].strip() if row else ''
+
+def _email_frame(values, first_row_index):
+    """Frame of one email column read from ``first_row_index`` on, its cells stripped of whitespace."""
+    frame = SheetFrame.from_values(values, first_row_index, header=[EMAIL_COLUMN])
+    return SheetFrame(frame.header, [frame.normalized(EMAIL_COLUMN, lower=False)], frame.row_indices)
+
+def read_new_emails(store, sheet_names, limit=None, cursors=None):
+    """Reads the email cells after each sheet's watermark, batching every sheet into one range read.
+
+    Each read starts at the sheet's last settled row so its fingerprint can be verified; if
+    a sheet changed above the watermark its header is resolved again and its email column
+    is reread from the top. At most ``limit`` rows per sheet are returned. Returns sheet
+    name -> a one-column SheetFrame of the emails, or None for sheets without an email column.
+
+    ``cursors`` maps sheet name -> SheetCursor for callers that keep their own watermarks;
+    the verification cursors from get_sheet_cursor are used by default.
+    """
+    if cursors is None:
+        cursors = {sheet_name: get_sheet_cursor(sheet_name) for sheet_name in sheet_names}
+    results = {}
+    pending = list(sheet_names)
+    for attempt in range(2):
+        unresolved = [sheet_name for sheet_name in pending if cursors[sheet_name].header is None]
+        if unresolved:
+            headers = store.read_ranges([(sheet_name, 'A1:Z1') for sheet_name in unresolved])
+            for sheet_name, header_values in zip(unresolved, headers):
+                if not _resolve_header(sheet_name, cursors[sheet_name], header_values):
+                    results[sheet_name] = None
+                    pending.remove(sheet_name)
+        if not pending:
+            break
+
+        ranges = []
+        for sheet_name in pending:
+            cursor = cursors[sheet_name]
+            column = cursor.email_column
+            end = cursor.processed_rows + limit if limit else ''
+            ranges.append((sheet_name, f"{column}{cursor.processed_rows}:{column}{end}"))
+
+        changed = []
+        for sheet_name, values in zip(pending, store.read_ranges(ranges)):
+            cursor = cursors[sheet_name]
+            if _cell(values, 0) == cursor.fingerprint:
+                results[sheet_name] = _email_frame(values[1:], cursor.processed_rows)
+            else:
+                logger.info(f"Sheet {sheet_name} changed above row {cursor.processed_rows}; rescanning from the header")
+                cursor.reset()
+                changed.append(sheet_name)
+        pending = changed
+
+    for sheet_name in pending:
+        logger.warning(f"Sheet {sheet_name} kept changing while being read; skipping it this cycle")
+        results[sheet_name] = None
+    return results
+
+def read_email_pages(store, positions, limit):
+    """Reads the next ``limit`` email cells of sheets already being scanned, in one range read.
+
+    ``positions`` maps sheet name -> 0-based index of the first row to read; the sheets'
+    cursors must have been resolved by read_new_emails earlier in the same pass. Returns
+    sheet name -> a one-column SheetFrame of the emails.
+    """
+    sheet_names = list(positions)
+    ranges = []
+    for sheet_name in sheet_names:
+        column = get_sheet_cursor(sheet_name).email_column
+        start = positions[sheet_name] + 1
+        ranges.append((sheet_name, f"{column}{start}:{column}{start + limit - 1}"))
+    return {sheet_name: _email_frame(values, positions[sheet_name])
+            for sheet_name, values in zip(sheet_names, store.read_ranges(ranges))}
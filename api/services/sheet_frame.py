@@ -0,0 +1,115 @@
+from array import array
+from itertools import compress, zip_longest
+
+class SheetFrame:
+    """Column-oriented block of sheet rows.
+
+    Cells are kept as one tuple per column instead of one list per row, and repeated
+    values within a column share a single string. Rows shorter than the header are never
+    padded in place: their missing cells, and columns past the widest row, read as ''.
+    ``row_indices`` holds each row's 0-based index in the sheet (the header row is 0), so
+    the bookkeeping stays correct after filtering or taking rows.
+    """
+
+    __slots__ = ('header', 'columns', 'row_indices', '_data')
+
+    def __init__(self, header, data, row_indices):
+        self.header = list(header)
+        self.columns = {}
+        for position, name in enumerate(self.header):
+            if name and name not in self.columns:
+                self.columns[name] = position
+        self._data = data
+        self.row_indices = row_indices
+
+    @classmethod
+    def from_rows(cls, rows, row_indices, header=()):
+        """Builds a frame from ragged row lists and their sheet row indices."""
+        data = []
+        for column in zip_longest(*rows, fillvalue=''):
+            seen = {}
+            data.append(tuple(map(seen.setdefault, column, column)))
+        return cls(header, data, array('q', row_indices))
+
+    @classmethod
+    def from_values(cls, values, first_row_index=0, header=None):
+        """Builds a frame from a values.get result whose first row sits at ``first_row_index``.
+
+        Without an explicit ``header`` the first row of ``values`` is taken as the header.
+        """
+        if header is None:
+            header = values[0] if values else []
+            values = values[1:]
+            first_row_index += 1
+        return cls.from_rows(values, range(first_row_index, first_row_index + len(values)), header)
+
+    def __len__(self):
+        return len(self.row_indices)
+
+    @property
+    def width(self):
+        return max(len(self.header), len(self._data))
+
+    def position(self, column):
+        """Returns the 0-based position of a column given by header name or position, or None."""
+        if isinstance(column, int):
+            return column
+        return self.columns.get(column)
+
+    def column(self, column):
+        """Returns the cells of one column as a tuple, '' where a row is too short."""
+        position = self.position(column)
+        if position is None:
+            raise KeyError(column)
+        if position < len(self._data):
+            return self._data[position]
+        return ('',) * len(self)
+
+    def normalized(self, column, lower=True):
+        """Returns the column's cells stripped of whitespace and, by default, lowercased."""
+        stripped = map(str.strip, self.column(column))
+        return tuple(map(str.lower, stripped)) if lower else tuple(stripped)
+
+    def nonblank(self, column):
+        """Returns a mask of the rows whose cell in ``column`` is not blank."""
+        return tuple(map(bool, map(str.strip, self.column(column))))
+
+    def project(self, columns):
+        """Returns a frame with only the given columns, in the given order."""
+        positions = [self.position(column) for column in columns]
+        if None in positions:
+            raise KeyError(columns[positions.index(None)])
+        header = [self.header[position] if position < len(self.header) else '' for position in positions]
+        return SheetFrame(header, [self.column(position) for position in positions], self.row_indices)
+
+    def filter(self, mask):
+        """Returns the rows where ``mask`` is true, keeping their sheet row indices."""
+        mask = tuple(mask)
+        return SheetFrame(self.header, [tuple(compress(column, mask)) for column in self._data],
+                          array('q', compress(self.row_indices, mask)))
+
+    def take(self, positions):
+        """Returns the rows at the given frame positions, in that order."""
+        positions = list(positions)
+        return SheetFrame(self.header, [tuple(column[p] for p in positions) for column in self._data],
+                          array('q', (self.row_indices[p] for p in positions)))
+
+    def take_rows(self, row_indices):
+        """Returns the rows with the given sheet row indices, in that order; unknown indices raise KeyError."""
+        lookup = {row_index: position for position, row_index in enumerate(self.row_indices)}
+        return self.take(lookup[row_index] for row_index in row_indices)
+
+    def row(self, position):
+        """Returns one row as a list without its trailing empty cells."""
+        row = [column[position] for column in self._data]
+        while row and row[-1] == '':
+            row.pop()
+        return row
+
+    def rows(self):
+        """Returns the rows as lists without trailing empty cells, e.g. for an append."""
+        return [self.row(position) for position in range(len(self))]
+
+    def items(self, column):
+        """Yields (row_index, cell) pairs of one column."""
+        return zip(self.row_indices, self.column(column))
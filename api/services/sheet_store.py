@@ -0,0 +1,250 @@
+import abc
+import json
+import logging
+import re
+import sqlite3
+import threading
+from api.config import SHEET_STORE_BACKEND, SQLITE_STORE_PATH
+from .row_deletion import coalesce_row_ranges
+from .sheet_frame import SheetFrame
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_RANGE = 'A:Z'
+DEFAULT_COLUMN_COUNT = 26
+
+_A1_RANGE = re.compile(r'^([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?$')
+
+def column_index(letters):
+    """Converts a column name such as 'A' or 'AB' to a 0-based index."""
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+def column_letter(index):
+    """Converts a 0-based column index to its column name."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+def parse_a1_range(cell_range):
+    """Parses an A1 range ('A:Z', 'S2:S', 'A5:Z9') into 0-based (row_start, row_end, col_start, col_end).
+
+    Ends are exclusive; ``None`` means the range is open on that side.
+    """
+    match = _A1_RANGE.match(cell_range.upper())
+    if not match:
+        raise ValueError(f"Unable to parse range: {cell_range}")
+    start_col, start_row, end_col, end_row = match.groups()
+    if end_col is None and end_row is None:  # single cell, e.g. 'A1'
+        end_col, end_row = start_col, start_row
+    row_start = int(start_row) - 1 if start_row else 0
+    row_end = int(end_row) if end_row else None
+    col_start = column_index(start_col) if start_col else 0
+    col_end = column_index(end_col) + 1 if end_col else None
+    return row_start, row_end, col_start, col_end
+
+def trim_values(rows):
+    """Drops trailing empty cells and trailing empty rows, as values.get does."""
+    trimmed = []
+    for row in rows:
+        row = list(row)
+        while row and row[-1] in ('', None):
+            row.pop()
+        trimmed.append(row)
+    while trimmed and not trimmed[-1]:
+        trimmed.pop()
+    return trimmed
+
+class SheetStore(abc.ABC):
+    """Row storage for the named sheets of one spreadsheet.
+
+    Row indices are 0-based and include the header row, matching the Sheets API.
+    """
+
+    @abc.abstractmethod
+    def read_range(self, sheet_name, cell_range=DEFAULT_RANGE):
+        """Returns the range's rows as lists of strings, trimmed like values.get."""
+
+    @abc.abstractmethod
+    def append_rows(self, sheet_name, rows):
+        """Appends rows at the end of the sheet."""
+
+    @abc.abstractmethod
+    def delete_rows(self, sheet_name, row_indices):
+        """Deletes rows by index; the rows below move up."""
+
+    @abc.abstractmethod
+    def get_sheet_properties(self, sheet_name):
+        """Returns the sheet's properties (sheetId, gridProperties, ...)."""
+
+    def read_ranges(self, ranges):
+        """Reads several (sheet_name, cell_range) pairs; returns one values list per pair."""
+        return [self.read_range(sheet_name, cell_range) for sheet_name, cell_range in ranges]
+
+    def delete_rows_in_sheets(self, deletions):
+        """Deletes rows from several sheets; ``deletions`` maps sheet name -> row indices."""
+        for sheet_name, row_indices in deletions.items():
+            self.delete_rows(sheet_name, row_indices)
+
+    def read_frame(self, sheet_name, cell_range=DEFAULT_RANGE, header=None):
+        """Reads a range into a SheetFrame; a range starting at row 1 supplies its own header."""
+        row_start = parse_a1_range(cell_range)[0]
+        values = self.read_range(sheet_name, cell_range)
+        if header is None and row_start > 0:
+            header = ()
+        return SheetFrame.from_values(values, row_start, header)
+
+    def read_row_frames(self, requested, headers=None, last_column='Z'):
+        """Fetches full rows by index from several sheets, one range per contiguous run.
+
+        ``requested`` maps sheet name -> row indices and ``headers`` optionally sheet name ->
+        header row; returns sheet name -> SheetFrame of the rows in ascending index order.
+        """
+        headers = headers or {}
+        ranges = [(sheet_name, start, end) for sheet_name, row_indices in requested.items()
+                  for start, end in reversed(coalesce_row_ranges(row_indices))]
+        values_list = self.read_ranges([(sheet_name, f"A{start + 1}:{last_column}{end}")
+                                        for sheet_name, start, end in ranges])
+        rows = {sheet_name: ([], []) for sheet_name in requested}
+        for (sheet_name, start, end), values in zip(ranges, values_list):
+            sheet_rows, row_indices = rows[sheet_name]
+            sheet_rows.extend(values[:end - start])
+            sheet_rows.extend([] for _ in range(end - start - len(values)))
+            row_indices.extend(range(start, end))
+        return {sheet_name: SheetFrame.from_rows(sheet_rows, row_indices, headers.get(sheet_name, ()))
+                for sheet_name, (sheet_rows, row_indices) in rows.items()}
+
+class GoogleSheetStore(SheetStore):
+    """Reads and writes the live spreadsheet through google_sheets_utils."""
+
+    def __init__(self):
+        # Imported here so the sqlite backend runs without the Google client libraries
+        from . import google_sheets_utils
+        self._sheets = google_sheets_utils
+
+    def read_range(self, sheet_name, cell_range=DEFAULT_RANGE):
+        return self._sheets.get_sheet_data(sheet_name, cell_range)
+
+    def append_rows(self, sheet_name, rows):
+        return self._sheets.update_sheet_data(sheet_name, rows)
+
+    def delete_rows(self, sheet_name, row_indices):
+        return self._sheets.delete_sheet_rows(sheet_name, row_indices)
+
+    def read_ranges(self, ranges):
+        return self._sheets.batch_get_sheet_data([f"{sheet_name}!{cell_range}" for sheet_name, cell_range in ranges])
+
+    def delete_rows_in_sheets(self, deletions):
+        return self._sheets.delete_rows_in_sheets(deletions)
+
+    def get_sheet_properties(self, sheet_name):
+        return self._sheets.get_sheet_properties(sheet_name)
+
+class SQLiteSheetStore(SheetStore):
+    """Keeps sheets in a local SQLite database with the same read/append/delete semantics.
+
+    Each row is stored as a JSON array keyed by an increasing sequence number, so a row's
+    index is its rank within the sheet and deletions shift later rows up like in Sheets.
+    """
+
+    def __init__(self, path=':memory:'):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS sheets (
+                sheet_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT UNIQUE NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sheet_rows (
+                sheet_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (sheet_id, seq)
+            ) WITHOUT ROWID;
+        ''')
+        self._conn.commit()
+
+    def _sheet_id(self, sheet_name):
+        row = self._conn.execute('SELECT sheet_id FROM sheets WHERE title = ?', (sheet_name,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown sheet: {sheet_name}")
+        return row[0]
+
+    def create_sheet(self, sheet_name, header=None):
+        """Adds an empty sheet (optionally with a header row); existing sheets are left untouched."""
+        with self._lock:
+            cursor = self._conn.execute('INSERT OR IGNORE INTO sheets (title) VALUES (?)', (sheet_name,))
+            self._conn.commit()
+            created = cursor.rowcount == 1
+        if created and header:
+            self.append_rows(sheet_name, [header])
+
+    def read_range(self, sheet_name, cell_range=DEFAULT_RANGE):
+        row_start, row_end, col_start, col_end = parse_a1_range(cell_range)
+        limit = -1 if row_end is None else max(row_end - row_start, 0)
+        with self._lock:
+            sheet_id = self._sheet_id(sheet_name)
+            cursor = self._conn.execute(
+                'SELECT data FROM sheet_rows WHERE sheet_id = ? ORDER BY seq LIMIT ? OFFSET ?',
+                (sheet_id, limit, row_start))
+            rows = [json.loads(data)[col_start:col_end] for (data,) in cursor]
+        return trim_values(rows)
+
+    def append_rows(self, sheet_name, rows):
+        with self._lock:
+            sheet_id = self._sheet_id(sheet_name)
+            (last_seq,) = self._conn.execute(
+                'SELECT COALESCE(MAX(seq), -1) FROM sheet_rows WHERE sheet_id = ?', (sheet_id,)).fetchone()
+            self._conn.executemany(
+                'INSERT INTO sheet_rows (sheet_id, seq, data) VALUES (?, ?, ?)',
+                ((sheet_id, last_seq + offset, json.dumps([str(v) for v in row]))
+                 for offset, row in enumerate(rows, start=1)))
+            self._conn.commit()
+        return {'updates': {'updatedRows': len(rows)}}
+
+    def delete_rows(self, sheet_name, row_indices):
+        ranges = coalesce_row_ranges(row_indices)
+        if not ranges:
+            logger.info(f"No rows to delete in {sheet_name}.")
+            return
+        with self._lock:
+            sheet_id = self._sheet_id(sheet_name)
+            seqs = [seq for (seq,) in self._conn.execute(
+                'SELECT seq FROM sheet_rows WHERE sheet_id = ? ORDER BY seq', (sheet_id,))]
+            doomed = [(sheet_id, seq) for start, end in ranges for seq in seqs[start:end]]
+            self._conn.executemany('DELETE FROM sheet_rows WHERE sheet_id = ? AND seq = ?', doomed)
+            self._conn.commit()
+        logger.info(f"Deleted {len(doomed)} rows from {sheet_name}.")
+
+    def get_sheet_properties(self, sheet_name):
+        with self._lock:
+            row = self._conn.execute('SELECT sheet_id FROM sheets WHERE title = ?', (sheet_name,)).fetchone()
+            if row is None:
+                return None
+            (row_count,) = self._conn.execute(
+                'SELECT COUNT(*) FROM sheet_rows WHERE sheet_id = ?', (row[0],)).fetchone()
+        return {'sheetId': row[0], 'title': sheet_name,
+                'gridProperties': {'rowCount': row_count, 'columnCount': DEFAULT_COLUMN_COUNT}}
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_sheet_store():
+    """Returns the process-wide store selected by SHEET_STORE_BACKEND."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if SHEET_STORE_BACKEND == 'sqlite':
+                _store = SQLiteSheetStore(SQLITE_STORE_PATH)
+            elif SHEET_STORE_BACKEND == 'google':
+                _store = GoogleSheetStore()
+            else:
+                raise ValueError(f"Unknown SHEET_STORE_BACKEND: {SHEET_STORE_BACKEND}")
+            logger.info(f"Using {type(_store).__name__} for sheet data")
+        return _store
@@ -0,0 +1,74 @@
+import json
+import logging
+import os
+import threading
+from api.config import SHEETS_DISCOVERY_DOCUMENT
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# googleapiclient renders every schema a method references into the method's docstring the
+# first time a resource is used, about 300ms for the full Sheets document. The bundled copy
+# keeps only the methods below, with empty schemas, so the client builds without that cost
+# and never fetches discovery over the network.
+# Resource path -> methods used by google_sheets_utils
+SHEETS_METHODS = {
+    ('spreadsheets',): ['get', 'batchUpdate'],
+    ('spreadsheets', 'values'): ['get', 'append', 'batchGet'],
+}
+_DROPPED_KEYS = ('description', 'documentationLink', 'icons', 'ownerDomain', 'ownerName', 'title', 'revision')
+
+_document = None
+_document_lock = threading.Lock()
+
+def _stub_schemas(method, schemas):
+    for key in ('request', 'response'):
+        ref = method.get(key, {}).get('$ref')
+        if ref:
+            schemas[ref] = {'id': ref, 'type': 'object'}
+
+def trim_discovery_document(document, methods=SHEETS_METHODS):
+    """Returns a copy of ``document`` with only ``methods`` and stub schemas for their bodies."""
+    trimmed = {key: value for key, value in document.items()
+               if key not in ('resources', 'schemas') and key not in _DROPPED_KEYS}
+    trimmed['resources'] = {}
+    schemas = {}
+    for path, names in methods.items():
+        source = document
+        target = trimmed
+        for resource in path:
+            source = source['resources'][resource]
+            target = target.setdefault('resources', {}).setdefault(resource, {})
+        target['methods'] = {}
+        for name in names:
+            method = {key: value for key, value in source['methods'][name].items() if key != 'description'}
+            method['parameters'] = {param: {key: value for key, value in spec.items() if key != 'description'}
+                                    for param, spec in method.get('parameters', {}).items()}
+            _stub_schemas(method, schemas)
+            target['methods'][name] = method
+    trimmed['schemas'] = schemas
+    return trimmed
+
+def load_discovery_document():
+    """Returns the parsed bundled document, read once per process."""
+    global _document
+    with _document_lock:
+        if _document is None:
+            with open(SHEETS_DISCOVERY_DOCUMENT, encoding='utf-8') as f:
+                _document = json.load(f)
+        return _document
+
+def _write_bundled_document():
+    """Regenerates the bundled document after an upgrade: python -m api.services.sheets_discovery"""
+    from googleapiclient import discovery_cache
+    source = os.path.join(os.path.dirname(discovery_cache.__file__), 'documents', 'sheets.v4.json')
+    with open(source, encoding='utf-8') as f:
+        trimmed = trim_discovery_document(json.load(f))
+    with open(SHEETS_DISCOVERY_DOCUMENT, 'w', encoding='utf-8') as f:
+        json.dump(trimmed, f, indent=1, sort_keys=True)
+        f.write('\n')
+    logger.info(f"Wrote {SHEETS_DISCOVERY_DOCUMENT} from {source}")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    _write_bundled_document()
@@ -0,0 +1,99 @@
+import builtins
+import importlib.util
+import logging
+import sys
+import threading
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Imported first by api/index.py, so this is the start of the cold start as far as the app can tell
+STARTED_AT = time.perf_counter()
+REPORT_TOP_IMPORTS = 25
+
+class ImportTimer:
+    """Records how long each module took to import the first time, nested imports included.
+
+    Wraps ``builtins.__import__`` from the top of api/index.py until startup completes;
+    modules already in ``sys.modules`` are passed straight through.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self._lock = threading.Lock()
+        self._original = builtins.__import__
+
+    def install(self):
+        if builtins.__import__ is self._original:
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        if builtins.__import__ == self._import:
+            builtins.__import__ = self._original
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original
+        if level:
+            try:
+                name_resolved = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__'))
+            except (ImportError, ValueError):
+                return original(name, globals, locals, fromlist, level)
+        else:
+            name_resolved = name
+        candidates = [name_resolved] + [f"{name_resolved}.{item}".strip('.') for item in fromlist or () if item != '*']
+        new = [module for module in candidates if module not in sys.modules]
+        if not new:
+            return original(name, globals, locals, fromlist, level)
+        started = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                for module in new:
+                    if module in sys.modules:
+                        self.durations.setdefault(module, elapsed)
+
+    def slowest(self, count=REPORT_TOP_IMPORTS):
+        with self._lock:
+            items = sorted(self.durations.items(), key=lambda item: item[1], reverse=True)
+        return [{"module": module, "seconds": round(seconds, 4)} for module, seconds in items[:count]]
+
+import_timer = ImportTimer()
+_milestones = {}
+
+def mark(milestone):
+    """Records the first time a startup milestone (e.g. 'first_response') is reached."""
+    if milestone not in _milestones:
+        _milestones[milestone] = time.perf_counter() - STARTED_AT
+        logger.info(f"Startup milestone {milestone} after {_milestones[milestone] * 1000:.0f} ms")
+
+def startup_report():
+    return {
+        "milestones": {milestone: round(seconds, 4) for milestone, seconds in _milestones.items()},
+        "slowest_imports": import_timer.slowest(),
+        "loaded": sorted(prefix for prefix in ("googleapiclient", "google.oauth2", "httpx", "dns")
+                         if prefix in sys.modules),
+    }
+
+class FirstResponseMiddleware:
+    """Pure ASGI middleware that marks 'first_response', then only forwards calls."""
+
+    def __init__(self, app):
+        self.app = app
+        self.marked = False
+
+    async def __call__(self, scope, receive, send):
+        if self.marked or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_and_mark(message):
+            await send(message)
+            if message["type"] == "http.response.start" and not self.marked:
+                self.marked = True
+                mark("first_response")
+                # Serverless runtimes may never run the startup event, so stop timing imports here too
+                import_timer.uninstall()
+
+        await self.app(scope, receive, send_and_mark)
@@ -1,65 +1,164 @@
 import httpx
 import asyncio
 import logging
-from api.config import EMAIL_COLUMN, VERIFIED_SHEET_NAME
-from api.services.google_sheets_utils import get_sheet_data, update_sheet_data, delete_sheet_rows
+from api.config import EMAIL_COLUMN, VERIFIED_SHEET_NAME, VERIFY_PAGE_SIZE
+from api.services.async_sheet_store import get_async_sheet_store
+from api.services.email_index import get_email_index
+from api.services.http_client import get_http_client
+from api.services.metrics import rows_total, stage, verify_requests_total
+from api.services.sheet_cursor import get_sheet_cursor, read_email_pages, read_new_emails
+from api.services.quota import PRIORITY_MOVE, request_priority
+from api.services.row_mover import RowMover, get_move_journal
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-async def verify_emails(sheet_name: str):
-    logger.info(f"Starting verification for sheet: {sheet_name}")
-    
-    data = get_sheet_data(sheet_name)
-    if not data:
-        logger.warning(f"No data found in sheet: {sheet_name}")
-        return
-
-    headers = data[0]
-    email_col_index = headers.index(EMAIL_COLUMN) if EMAIL_COLUMN in headers else None
+BATCH_SIZE = 100
+VERIFY_URL = "https://headless-webfix.vercel.app/verify-email?email={email}"
 
-    if email_col_index is None:
-        logger.error(f"No column with header '{EMAIL_COLUMN}' found in sheet: {sheet_name}")
-        return
+def _read_new_emails(store, sheet_names, limit):
+    try:
+        return read_new_emails(store, sheet_names, limit)
+    except Exception as e:
+        # One bad range fails the whole batchGet, so fall back to reading the sheets one by one
+        logger.error(f"Batched read of {', '.join(sheet_names)} failed, reading sheets separately: {e}")
+    entries_by_sheet = {}
+    for sheet_name in sheet_names:
+        try:
+            entries_by_sheet.update(read_new_emails(store, [sheet_name], limit))
+        except Exception as e:
+            logger.error(f"Error reading sheet {sheet_name}: {e}")
+    return entries_by_sheet
 
-    rows_to_move = []
-    rows_to_delete = []
+async def _verify_candidates(client, sheet_name, candidates):
+    """Checks (row_index, email) pairs against the verifier; returns [(row_index, email, exists)] for the answered ones."""
+    results = []
 
-    rows = data[1:]  # Remove header row
-    batch_size = 100
+    logger.info(f"Processing {len(candidates)} rows from {sheet_name} in batches of {BATCH_SIZE}")
 
-    logger.info(f"Processing {len(rows)} rows in batches of {batch_size}")
+    for i in range(0, len(candidates), BATCH_SIZE):
+        batch = candidates[i:i + BATCH_SIZE]
+        requests_list = [VERIFY_URL.format(email=email) for _, email in batch]
 
-    timeout = httpx.Timeout(30.0)  # 30 seconds timeout
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        for i in range(0, len(rows), batch_size):
-            batch = rows[i:i + batch_size]
-            requests_list = [f"https://headless-webfix.vercel.app/verify-email?email={row[email_col_index]}" for row in batch if row[email_col_index]]
+        try:
+            responses = await asyncio.gather(*(client.get(url) for url in requests_list))
+            logger.info(f"{sheet_name}: batch {i // BATCH_SIZE + 1} of {len(candidates) // BATCH_SIZE + 1} processed.")
+        except httpx.RequestError as e:
+            logger.error(f"Error during batch processing: {e}")
+            verify_requests_total.inc(len(batch), result='request_error')
+            continue  # Skip the current batch and move to the next
 
+        for index, response in enumerate(responses):
             try:
-                responses = await asyncio.gather(*(client.get(url) for url in requests_list))
-                logger.info(f"Batch {i // batch_size + 1} of {len(rows) // batch_size + 1} processed.")
-            except httpx.RequestError as e:
-                logger.error(f"Error during batch processing: {e}")
-                continue  # Skip the current batch and move to the next
-
-            for index, response in enumerate(responses):
-                try:
-                    logger.debug(f"Response from URL {requests_list[index]}: {response.text}")
-                    email_data = response.json()
-                    exists = email_data.get("account_exists", False)
-                    if exists:
-                        rows_to_move.append(batch[index])
-                    # Use 'i + 1 + index' to account for header and zero-based indexing
-                    rows_to_delete.append(i + 1 + index)
-                except ValueError as e:
-                    logger.error(f"Error parsing response for URL {requests_list[index]}: {e}")
-
-    if rows_to_move:
-        update_sheet_data(VERIFIED_SHEET_NAME, rows_to_move)
-        logger.info(f"Moved {len(rows_to_move)} rows to {VERIFIED_SHEET_NAME}.")
-
-    # Delete all processed rows from the original sheet
-    if rows_to_delete:
-        delete_sheet_rows(sheet_name, sorted(rows_to_delete, reverse=True))
-        logger.info(f"Deleted {len(rows_to_delete)} rows from {sheet_name}.")
+                logger.debug(f"Response from URL {requests_list[index]}: {response.text}")
+                email_data = response.json()
+                exists = email_data.get("account_exists", False)
+                row_index, email = batch[index]
+                results.append((row_index, email, bool(exists)))
+                verify_requests_total.inc(result='ok')
+                rows_total.inc(outcome='verified_exists' if exists else 'verified_missing')
+            except ValueError as e:
+                logger.error(f"Error parsing response for URL {requests_list[index]}: {e}")
+                verify_requests_total.inc(result='invalid_response')
+
+    return results
+
+async def _verify_page(client, pages):
+    # Only rows with an email are verified; blank ones are left in place
+    candidates = {sheet_name: frame.filter(frame.nonblank(EMAIL_COLUMN)) for sheet_name, frame in pages.items()}
+    results = await asyncio.gather(
+        *(_verify_candidates(client, sheet_name, list(frame.items(EMAIL_COLUMN)))
+          for sheet_name, frame in candidates.items()),
+        return_exceptions=True)
+    processed = {}
+    for sheet_name, result in zip(pages, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error during verification for sheet {sheet_name}: {result}")
+            continue
+        processed[sheet_name] = result
+    return processed
+
+async def verify_sheets(sheet_names, store=None, client=None, gate=None):
+    """Runs one verification pass over several sheets.
+
+    Sheets are streamed in pages of VERIFY_PAGE_SIZE rows. Each round reads the next page
+    of every sheet together, verifies the sheets concurrently, and commits the round as one
+    journaled chunk (one append to VERIFIED, one grouped deletion), so memory use does not
+    depend on sheet size and a crash loses at most the chunk in flight. All sheet I/O goes
+    through an AsyncSheetStore so the event loop keeps serving requests.
+
+    With a ChangeGate only the sheets it considers due are read, and each sheet's first
+    page tells the gate whether anything was added since the last pass.
+    """
+    logger.info(f"Starting verification for sheets: {', '.join(sheet_names)}")
+
+    store = store or get_async_sheet_store()
+    async with store.mutation_lock:
+        await _verify_pass(store, list(sheet_names), client, gate)
+
+async def _verify_pass(store, sheet_names, client, gate):
+    mover = RowMover(store.store, get_move_journal(), VERIFIED_SHEET_NAME, get_email_index())
+    with request_priority(PRIORITY_MOVE), stage('resume'):
+        if await store.run(mover.resume):
+            # Resumed deletions shifted rows under the cursors, so let them re-verify their fingerprints
+            for sheet_name in sheet_names:
+                get_sheet_cursor(sheet_name).reset()
+            if gate is not None:
+                gate.reset()
+
+    if gate is not None:
+        sheet_names = gate.due(sheet_names)
+        if not sheet_names:
+            logger.info("No sheet is due for a change check this cycle")
+            return
+
+    with stage('read_emails'):
+        pages = await store.run(_read_new_emails, store.store, sheet_names, VERIFY_PAGE_SIZE)
+    for sheet_name, entries in pages.items():
+        if entries is not None and not entries:
+            logger.info(f"No new rows in sheet: {sheet_name}")
+        if gate is not None:
+            # Sheets without an email column back off like unchanged ones
+            gate.record(sheet_name, bool(entries))
+
+    await _stream_pages(store, mover, client or get_http_client(), pages)
+
+async def _stream_pages(store, mover, client, pages):
+    advancing = set(pages)  # sheets whose watermark can still move forward this pass
+    moved_total = deleted_total = 0
+    while True:
+        pages = {sheet_name: entries for sheet_name, entries in pages.items() if entries}
+        if not pages:
+            break
+
+        with stage('verify_http'):
+            processed = await _verify_page(client, pages)
+        processed = {sheet_name: results for sheet_name, results in processed.items() if results}
+        if processed:
+            # Finishing the move is queued ahead of other sheets traffic under the quota governor
+            with request_priority(PRIORITY_MOVE), stage('commit'):
+                moved_total += await store.run(mover.commit, processed)
+            deleted_total += sum(len(results) for results in processed.values())
+
+        positions = {}
+        for sheet_name, entries in pages.items():
+            deleted = {row_index for row_index, _, _ in processed.get(sheet_name, ())}
+            if sheet_name in advancing and not get_sheet_cursor(sheet_name).advance(entries.items(EMAIL_COLUMN), deleted):
+                advancing.discard(sheet_name)
+            # A short page is the end of the sheet, or ends in blank rows that the API trims;
+            # in the latter case the rows after them are picked up on the next pass
+            if len(entries) == VERIFY_PAGE_SIZE:
+                # Rows after this page moved up by the number deleted from it
+                positions[sheet_name] = entries.row_indices[-1] + 1 - len(deleted)
+        if not positions:
+            break
+        with stage('read_pages'):
+            pages = await store.run(read_email_pages, store.store, positions, VERIFY_PAGE_SIZE)
+
+    if moved_total:
+        logger.info(f"Moved {moved_total} rows to {VERIFIED_SHEET_NAME}.")
+    if deleted_total:
+        logger.info(f"Deleted {deleted_total} processed rows from the source sheets.")
+
+async def verify_emails(sheet_name: str):
+    await verify_sheets([sheet_name])
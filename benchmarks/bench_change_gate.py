@@ -0,0 +1,138 @@
+"""Counts the Sheets reads of a simulated day of verification cycles, with and without the change gate.
+
+Sheets live in a SQLite store and the verifier is stubbed with httpx.MockTransport. Time
+is simulated: the verification job runs every VERIFY_INTERVAL seconds without the gate,
+and after the delay returned by ChangeGate.next_delay with it. A few bursts of new rows
+land on random sheets during the day. Reported: read calls, cells read, and how long the
+new rows waited before being verified.
+
+Run from the repository root:  python -m benchmarks.bench_change_gate
+(set VERIFY_MAX_INTERVAL to try other caps)
+"""
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+
+import httpx
+
+from api.config import EMAIL_COLUMN, VERIFIED_SHEET_NAME, VERIFY_INTERVAL, VERIFY_MAX_INTERVAL
+from api.services.async_sheet_store import AsyncSheetStore
+from api.services.change_gate import ChangeGate
+from api.services.email_index import EmailIndex
+from api.services.row_mover import MoveJournal
+from api.services.sheet_cursor import get_sheet_cursor
+from api.services.sheet_store import DEFAULT_RANGE, SheetStore, SQLiteSheetStore
+from api.services import verify_emails
+
+SHEETS = ["GMAIL", "AOL", "OUTLOOK", "HOTMAIL"]
+SIMULATED_SECONDS = 24 * 3600
+BURSTS = 12  # bursts of new rows over the day
+BURST_ROWS = 50
+
+class CountingSheetStore(SheetStore):
+    """Wraps a store and counts read calls (one per Sheets API request) and the cells they return."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.reads = 0
+        self.cells = 0
+
+    def _count(self, values_lists):
+        self.reads += 1
+        self.cells += sum(len(row) for values in values_lists for row in values)
+        return values_lists
+
+    def read_range(self, sheet_name, cell_range=DEFAULT_RANGE):
+        return self._count([self.inner.read_range(sheet_name, cell_range)])[0]
+
+    def read_ranges(self, ranges):
+        return self._count(self.inner.read_ranges(ranges))
+
+    def append_rows(self, sheet_name, rows):
+        return self.inner.append_rows(sheet_name, rows)
+
+    def delete_rows(self, sheet_name, row_indices):
+        return self.inner.delete_rows(sheet_name, row_indices)
+
+    def delete_rows_in_sheets(self, deletions):
+        return self.inner.delete_rows_in_sheets(deletions)
+
+    def get_sheet_properties(self, sheet_name):
+        return self.inner.get_sheet_properties(sheet_name)
+
+class SimulatedGate(ChangeGate):
+    """ChangeGate reading the simulated clock instead of time.monotonic."""
+
+    def __init__(self, clock):
+        super().__init__(VERIFY_INTERVAL, VERIFY_MAX_INTERVAL)
+        self.clock = clock
+
+    def due(self, sheet_names, now=None):
+        return super().due(sheet_names, self.clock[0])
+
+    def record(self, sheet_name, changed, now=None):
+        return super().record(sheet_name, changed, self.clock[0])
+
+    def next_delay(self, now=None):
+        return super().next_delay(self.clock[0])
+
+async def simulate(use_gate):
+    inner = SQLiteSheetStore()
+    header = ["first_name", "last_name", EMAIL_COLUMN]
+    inner.create_sheet(VERIFIED_SHEET_NAME, header)
+    for sheet_name in SHEETS:
+        inner.create_sheet(sheet_name, header)
+        get_sheet_cursor(sheet_name).reset()
+    store = CountingSheetStore(inner)
+    async_store = AsyncSheetStore(store)
+
+    rng = random.Random(7)
+    bursts = sorted((rng.uniform(0, SIMULATED_SECONDS), rng.choice(SHEETS)) for _ in range(BURSTS))
+    pending = {}  # email -> time it was added
+    waits = []
+    clock = [0.0]
+    gate = SimulatedGate(clock) if use_gate else None
+    verified = set()
+
+    def verifier(request):
+        email = request.url.params["email"]
+        verified.add(email)
+        return httpx.Response(200, json={"account_exists": True})
+
+    cycles = 0
+    async with httpx.AsyncClient(transport=httpx.MockTransport(verifier)) as client:
+        while clock[0] < SIMULATED_SECONDS:
+            while bursts and bursts[0][0] <= clock[0]:
+                added_at, sheet_name = bursts.pop(0)
+                rows = [["First", "Last", f"user{len(pending)}.{i}@{sheet_name.lower()}.com"] for i in range(BURST_ROWS)]
+                inner.append_rows(sheet_name, rows)
+                pending.update((row[2], added_at) for row in rows)
+            await verify_emails.verify_sheets(SHEETS, store=async_store, client=client, gate=gate)
+            cycles += 1
+            for email in verified:
+                waits.append(clock[0] - pending.pop(email))
+            verified.clear()
+            clock[0] += (gate.next_delay() if gate else None) or VERIFY_INTERVAL
+    async_store.shutdown()
+    return cycles, store.reads, store.cells, waits
+
+def main():
+    workdir = tempfile.TemporaryDirectory(prefix="bench-change-gate-")
+    journal = MoveJournal(os.path.join(workdir.name, "move-journal.db"))
+    index = EmailIndex(os.path.join(workdir.name, "email-index.db"))
+    # Keep the benchmark off the real journal and index
+    verify_emails.get_move_journal = lambda: journal
+    verify_emails.get_email_index = lambda: index
+    print(f"{SIMULATED_SECONDS // 3600}h simulated, {len(SHEETS)} sheets, {BURSTS} bursts of {BURST_ROWS} rows, "
+          f"VERIFY_INTERVAL={VERIFY_INTERVAL:.0f}s VERIFY_MAX_INTERVAL={VERIFY_MAX_INTERVAL:.0f}s")
+    print(f"{'mode':<10} {'cycles':>7} {'reads':>7} {'cells read':>11} {'mean wait s':>12} {'max wait s':>11}")
+    for use_gate in (False, True):
+        cycles, reads, cells, waits = asyncio.run(simulate(use_gate))
+        mode = "gate" if use_gate else "no gate"
+        print(f"{mode:<10} {cycles:>7} {reads:>7} {cells:>11} {statistics.mean(waits):>12.0f} {max(waits):>11.0f}")
+    workdir.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Measures the cold start of api/index.py and the cost of building the Sheets client.
+
+Each measurement runs in a fresh interpreter, like a serverless cold start.
+Run from the repository root:  python -m benchmarks.bench_cold_start
+"""
+import statistics
+import subprocess
+import sys
+
+RUNS = 5
+
+IMPORT_APP = """
+import time
+started = time.perf_counter()
+import api.index
+print(time.perf_counter() - started)
+"""
+
+FIRST_RESPONSE = """
+import time
+started = time.perf_counter()
+import asyncio, api.index
+async def main():
+    sent = []
+    requests = [{"type": "http.request", "body": b""}]
+    async def receive():
+        return requests.pop() if requests else {"type": "http.disconnect"}
+    async def send(message):
+        sent.append(message)
+    scope = {"type": "http", "method": "GET", "path": "/api/python", "raw_path": b"/api/python",
+             "query_string": b"", "headers": [], "http_version": "1.1", "scheme": "http",
+             "server": ("test", 80), "client": ("test", 1234), "root_path": ""}
+    await api.index.app(scope, receive, send)
+asyncio.run(main())
+print(time.perf_counter() - started)
+"""
+
+BUILD_CLIENT = """
+import time
+started = time.perf_counter()
+from google.auth.credentials import AnonymousCredentials
+from googleapiclient.discovery import build, build_from_document
+from api.services.sheets_discovery import load_discovery_document
+imported = time.perf_counter()
+if {bundled}:
+    service = build_from_document(load_discovery_document(), credentials=AnonymousCredentials())
+else:
+    service = build("sheets", "v4", credentials=AnonymousCredentials(), static_discovery=True, cache_discovery=False)
+service.spreadsheets().values()
+print(time.perf_counter() - imported)
+"""
+
+def run(code):
+    samples = []
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        samples.append(float(output.split()[-1]) * 1000)
+    return statistics.median(samples)
+
+def main():
+    print(f"{'measurement':<42} {'median ms':>10}")
+    print(f"{'import api.index':<42} {run(IMPORT_APP):>10.1f}")
+    print(f"{'import + first /api/python response':<42} {run(FIRST_RESPONSE):>10.1f}")
+    print(f"{'Sheets client, full discovery document':<42} {run(BUILD_CLIENT.format(bundled=False)):>10.1f}")
+    print(f"{'Sheets client, bundled trimmed document':<42} {run(BUILD_CLIENT.format(bundled=True)):>10.1f}")
+
+if __name__ == "__main__":
+    main()
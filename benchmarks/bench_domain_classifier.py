@@ -0,0 +1,58 @@
+"""Compares disposable-domain lookups against a list scan and the indexed DomainTable.
+
+Run from the repository root:  python -m benchmarks.bench_domain_classifier
+"""
+import os
+import random
+import tempfile
+import time
+
+from api.services.domain_classifier import DomainTable
+
+LIST_SIZE = 50_000
+LOOKUPS = 1_000_000
+
+def synthetic_domains(rng, count):
+    tlds = ["com", "net", "org", "io", "co.uk"]
+    return [f"tmp{rng.getrandbits(40):x}.{rng.choice(tlds)}" for _ in range(count)]
+
+def main():
+    rng = random.Random(42)
+    listed = synthetic_domains(rng, LIST_SIZE)
+    # Half hits (a quarter of them on subdomains), half misses
+    queries = []
+    for _ in range(LOOKUPS):
+        roll = rng.random()
+        if roll < 0.375:
+            queries.append(rng.choice(listed))
+        elif roll < 0.5:
+            queries.append(f"mx{rng.randrange(10)}.{rng.choice(listed)}")
+        else:
+            queries.append(f"corp{rng.getrandbits(32):x}.com")
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write("\n".join(listed))
+    try:
+        started = time.perf_counter()
+        table = DomainTable(f.name, lambda line: (line, True))
+        table.lookup("warmup.com")
+        load_ms = (time.perf_counter() - started) * 1000
+
+        print(f"{'lookup':<14} {'lookups':>9} {'hits':>8} {'total s':>9} {'ns/lookup':>10}")
+        # The old check rebuilt a list and scanned it on every call; sample it so it finishes
+        legacy_queries = queries[:2_000]
+        started = time.perf_counter()
+        hits = sum(1 for domain in legacy_queries if domain in listed)
+        elapsed = time.perf_counter() - started
+        print(f"{'list scan':<14} {len(legacy_queries):>9} {hits:>8} {elapsed:>9.3f} {elapsed / len(legacy_queries) * 1e9:>10.0f}")
+
+        started = time.perf_counter()
+        hits = sum(1 for domain in queries if table.lookup(domain, False))
+        elapsed = time.perf_counter() - started
+        print(f"{'DomainTable':<14} {len(queries):>9} {hits:>8} {elapsed:>9.3f} {elapsed / len(queries) * 1e9:>10.0f}")
+        print(f"DomainTable load of {len(table)} domains: {load_ms:.1f} ms")
+    finally:
+        os.unlink(f.name)
+
+if __name__ == "__main__":
+    main()
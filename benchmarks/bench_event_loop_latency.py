@@ -0,0 +1,120 @@
+"""Measures /api/python latency while a verification cycle runs in the background.
+
+Sheet I/O is simulated with a SQLite store that blocks for a fixed time per call, like a
+Sheets round-trip. The cycle is run twice: once with the blocking calls made directly on
+the event loop (how verify_emails used to behave) and once offloaded to the sheet I/O
+thread pool.
+
+Run from the repository root:  python -m benchmarks.bench_event_loop_latency
+"""
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+
+from api.index import app
+from api.config import EMAIL_COLUMN, VERIFIED_SHEET_NAME
+from api.services import verify_emails
+from api.services.async_sheet_store import AsyncSheetStore
+from api.services.email_index import EmailIndex
+from api.services.row_mover import MoveJournal
+from api.services.sheet_cursor import get_sheet_cursor
+from api.services.sheet_store import DEFAULT_RANGE, SheetStore, SQLiteSheetStore
+from api.services.verify_emails import verify_sheets
+
+SHEETS = ["GMAIL", "AOL", "OUTLOOK", "HOTMAIL"]
+ROWS_PER_SHEET = 2000
+SHEETS_LATENCY = 0.25  # seconds each simulated Sheets call blocks for
+VERIFIER_LATENCY = 0.01  # seconds per verifier request
+PROBE_INTERVAL = 0.005
+
+class SlowSheetStore(SheetStore):
+    """Wraps a store and blocks for ``latency`` seconds on every call."""
+
+    def __init__(self, inner, latency):
+        self.inner = inner
+        self.latency = latency
+
+    def _call(self, func, *args):
+        time.sleep(self.latency)
+        return func(*args)
+
+    def read_range(self, sheet_name, cell_range=DEFAULT_RANGE):
+        return self._call(self.inner.read_range, sheet_name, cell_range)
+
+    def read_ranges(self, ranges):
+        return self._call(self.inner.read_ranges, ranges)
+
+    def append_rows(self, sheet_name, rows):
+        return self._call(self.inner.append_rows, sheet_name, rows)
+
+    def delete_rows(self, sheet_name, row_indices):
+        return self._call(self.inner.delete_rows, sheet_name, row_indices)
+
+    def delete_rows_in_sheets(self, deletions):
+        return self._call(self.inner.delete_rows_in_sheets, deletions)
+
+    def get_sheet_properties(self, sheet_name):
+        return self._call(self.inner.get_sheet_properties, sheet_name)
+
+class InlineSheetStore(AsyncSheetStore):
+    """Runs the blocking calls straight on the event loop, as the pipeline used to."""
+
+    async def run(self, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+def seeded_store():
+    store = SQLiteSheetStore()
+    header = ["first_name", "last_name", EMAIL_COLUMN]
+    store.create_sheet(VERIFIED_SHEET_NAME, header)
+    for sheet_name in SHEETS:
+        store.create_sheet(sheet_name, header)
+        store.append_rows(sheet_name, [["First", "Last", f"user{i}@{sheet_name.lower()}.com"]
+                                       for i in range(ROWS_PER_SHEET)])
+        get_sheet_cursor(sheet_name).reset()
+    return SlowSheetStore(store, SHEETS_LATENCY)
+
+async def verifier(request):
+    await asyncio.sleep(VERIFIER_LATENCY)
+    email = request.url.params["email"]
+    return httpx.Response(200, json={"account_exists": hash(email) % 2 == 0})
+
+async def run_mode(label, async_store_cls):
+    async_store = async_store_cls(seeded_store())
+    latencies = []
+    async with httpx.AsyncClient(transport=httpx.MockTransport(verifier)) as verifier_client, \
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as api_client:
+        started = time.perf_counter()
+        cycle = asyncio.create_task(verify_sheets(SHEETS, store=async_store, client=verifier_client))
+        while not cycle.done():
+            sent = time.perf_counter()
+            response = await api_client.get("/api/python")
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - sent) * 1000)
+            await asyncio.sleep(PROBE_INTERVAL)
+        await cycle
+        elapsed = time.perf_counter() - started
+    async_store.shutdown()
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<10} cycle {elapsed:6.2f}s  probes {len(latencies):>5}  "
+          f"p50 {statistics.median(latencies):8.2f}ms  p99 {p99:8.2f}ms  max {latencies[-1]:8.2f}ms")
+
+async def main():
+    workdir = tempfile.TemporaryDirectory(prefix="bench-event-loop-")
+    journal = MoveJournal(os.path.join(workdir.name, "move-journal.db"))
+    index = EmailIndex(os.path.join(workdir.name, "email-index.db"))
+    # Keep the benchmark off the real journal and index
+    verify_emails.get_move_journal = lambda: journal
+    verify_emails.get_email_index = lambda: index
+    print(f"{len(SHEETS)} sheets x {ROWS_PER_SHEET} rows, {SHEETS_LATENCY * 1000:.0f}ms per Sheets call")
+    await run_mode("inline", InlineSheetStore)
+    await run_mode("offloaded", AsyncSheetStore)
+    workdir.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""Requests/sec of one worker for the controllers, before and after the fast JSON path.
+
+"before" rebuilds the endpoints as they were: default JSONResponse, handlers returning
+dicts and pydantic models through jsonable_encoder, stdlib json request parsing.
+"after" is the app that ships, api.index.app, with its middleware and every router
+(its startup event is not run, so no background jobs start).
+Requests are driven straight through the ASGI interface, so the numbers are the
+framework's CPU cost per request without network or server overhead.
+
+Run from the repository root:  python -m benchmarks.bench_json_responses
+"""
+import asyncio
+import json
+import logging
+import time
+
+import httpx
+from fastapi import APIRouter, FastAPI
+
+from api.controllers.apicontroller import CheckBalanceRequest
+from api.controllers.usercontroller import EmailLoginRequest, LoginResponse
+
+logger = logging.getLogger("api.controllers")
+
+REQUESTS = 5000
+CLIENT_CYCLES = 200
+
+legacy_router = APIRouter()
+
+@legacy_router.get("/api/python")
+def legacy_hello_world():
+    return {"message": "Hello World"}
+
+@legacy_router.post("/api/check-balance")
+def legacy_check_balance(request: CheckBalanceRequest):
+    logger.info(f"Checking balance for wallet ID {request.wallet_id}")
+    return {"status": "success", "balance": "100.00"}
+
+@legacy_router.post("/api/gmail-login")
+def legacy_gmail_login(request: EmailLoginRequest):
+    logger.info(f"Attempting Gmail login for email {request.email}")
+    if request.email == "test@gmail.com" and request.password == "password":
+        return LoginResponse(status="success", detail="Gmail login successful")
+    return LoginResponse(status="invalid", detail="Invalid Gmail credentials")
+
+def legacy_app():
+    app = FastAPI()
+    app.include_router(legacy_router)
+    return app
+
+ENDPOINTS = [
+    ("GET /api/python", "GET", "/api/python", b""),
+    ("POST /api/check-balance", "POST", "/api/check-balance", json.dumps({"wallet_id": "w-123"}).encode()),
+    ("POST /api/gmail-login", "POST", "/api/gmail-login",
+     json.dumps({"email": "test@gmail.com", "password": "password"}).encode()),
+]
+
+async def call(app, method, path, body):
+    scope = {"type": "http", "method": method, "path": path, "raw_path": path.encode(), "query_string": b"",
+             "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+             "http_version": "1.1", "scheme": "http", "server": ("bench", 80), "client": ("bench", 1234),
+             "root_path": ""}
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = []
+
+    async def receive():
+        return messages.pop() if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    assert status == [200], status
+
+async def requests_per_second(app, method, path, body):
+    for _ in range(100):  # warm up
+        await call(app, method, path, body)
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        await call(app, method, path, body)
+    return REQUESTS / (time.perf_counter() - started)
+
+async def client_per_cycle():
+    # What verify_sheets used to do: build and close a client (and its SSL context) every cycle
+    started = time.perf_counter()
+    for _ in range(CLIENT_CYCLES):
+        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)):
+            pass
+    return (time.perf_counter() - started) / CLIENT_CYCLES
+
+async def main():
+    from api.index import app
+
+    apps = {"before": legacy_app(), "after": app}
+    print(f"{'endpoint':<26} {'before req/s':>13} {'after req/s':>12} {'speedup':>8}")
+    for label, method, path, body in ENDPOINTS:
+        before = await requests_per_second(apps["before"], method, path, body)
+        after = await requests_per_second(apps["after"], method, path, body)
+        print(f"{label:<26} {before:>13.0f} {after:>12.0f} {after / before:>7.2f}x")
+    print(f"AsyncClient created per verification cycle: {await client_per_cycle() * 1000:.1f} ms per cycle "
+          f"(shared client: once per process)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+"""Runs the Sheets primitives and a full verification cycle against a local fake Sheets server.
+
+Each scenario seeds the fake server (benchmarks/fake_sheets.py), then runs every step in
+its own fresh interpreter pointed at it through SHEETS_API_ENDPOINT, with the verifier
+stubbed by httpx.MockTransport. Reported per step: wall time, Sheets API calls by method,
+bytes sent to / received from the server, injected 429s, the peak RSS of the step's
+process and how much of it the step added on top of the imports and the Sheets client.
+
+Run from the repository root:
+    python -m benchmarks.bench_offline_pipeline                 # 1k and 100k rows
+    python -m benchmarks.bench_offline_pipeline 1m --latency 0.05 --throttle-rate 0.02
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+SCENARIOS = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+SHEETS = ["GMAIL", "AOL", "OUTLOOK", "HOTMAIL"]
+EXISTS_EVERY = 10  # one verified email in ten has an account
+
+STEPS = ["read full sheets", "append 10% to VERIFIED", "delete every 10th row", "verification cycle"]
+
+def seed(url, row_count):
+    import httpx
+
+    from api.config import EMAIL_COLUMN, VERIFIED_SHEET_NAME
+
+    header = ["first_name", "last_name", EMAIL_COLUMN]
+    per_sheet = row_count // len(SHEETS)
+    with httpx.Client(base_url=url, timeout=600) as control:
+        control.post("/_fake/seed", json={"header": header,
+                                          "sheets": {**{s: per_sheet for s in SHEETS}, VERIFIED_SHEET_NAME: 0},
+                                          "row_template": ["First {i}", "Last", "user{i}@{sheet}.com"]})
+
+def run_step(row_count, step, url):
+    """Runs one step inside its own child interpreter, so its peak RSS is not masked by earlier steps.
+
+    SHEETS_API_ENDPOINT is already set for api.config; the sheets keep the state left by
+    the previous steps on the fake server.
+    """
+    import asyncio
+    import resource
+
+    import httpx
+
+    from api.config import VERIFIED_SHEET_NAME
+    from api.services import google_sheets_utils
+    from api.services.quota import governor
+    from api.services.verify_emails import verify_sheets
+
+    # Retries still happen on injected 429s, but without the production backoff delays
+    governor.base_delay = 0.01
+    governor.max_delay = 0.1
+
+    control = httpx.Client(base_url=url, timeout=600)
+    per_sheet = row_count // len(SHEETS)
+
+    def verifier(request):
+        number = int(request.url.params["email"][4:].split("@")[0])
+        return httpx.Response(200, json={"account_exists": number % EXISTS_EVERY == 0})
+
+    async def verification_cycle():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(verifier)) as client:
+            await verify_sheets(SHEETS, client=client)
+
+    steps = {
+        "read full sheets": lambda: [google_sheets_utils.get_sheet_data(sheet) for sheet in SHEETS],
+        "append 10% to VERIFIED": lambda: google_sheets_utils.update_sheet_data(
+            VERIFIED_SHEET_NAME, [["First", "Last", f"moved{i}@example.com"] for i in range(row_count // 10)]),
+        "delete every 10th row": lambda: google_sheets_utils.delete_sheet_rows(
+            SHEETS[0], list(range(1, per_sheet + 1, 10))),
+        "verification cycle": lambda: asyncio.run(verification_cycle()),
+    }
+    google_sheets_utils.get_sheets_service()  # build the client before the baseline, it is not part of any step
+    control.post("/_fake/stats", json={"reset": True})
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+    started = time.perf_counter()
+    steps[step]()
+    wall = time.perf_counter() - started
+    stats = control.post("/_fake/stats", json={"reset": True}).json()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"step": step, "wall": wall, "peak_rss_mb": peak_rss, "step_rss_mb": peak_rss - baseline_rss, **stats}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", default=["1k", "100k"], help=f"any of {', '.join(SCENARIOS)}")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake server waits per call")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of calls answered with 429")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--step", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    if args.child:
+        print(json.dumps(run_step(SCENARIOS[args.child], args.step, args.url)))
+        return
+
+    from benchmarks.fake_sheets import start_server
+
+    server, url = start_server(args.latency, args.throttle_rate)
+    workdir = tempfile.mkdtemp(prefix="bench-offline-")
+    env = dict(os.environ, SHEETS_API_ENDPOINT=url, SHEET_STORE_BACKEND="google",
+               SHEETS_READ_QUOTA_PER_MINUTE="1000000", SHEETS_WRITE_QUOTA_PER_MINUTE="1000000",
+               MOVE_JOURNAL_PATH=os.path.join(workdir, "move-journal.db"),
+               EMAIL_INDEX_PATH=os.path.join(workdir, "email-index.db"))
+    print(f"fake Sheets server at {url} latency={args.latency}s throttle_rate={args.throttle_rate}")
+    print(f"{'scenario':<9} {'step':<24} {'wall s':>8} {'calls':>6} {'sent KB':>9} {'recv KB':>10} "
+          f"{'429s':>5} {'peak RSS':>9} {'step RSS':>9}  calls by method")
+    try:
+        for scenario in args.scenarios:
+            seed(url, SCENARIOS[scenario])
+            for step in STEPS:
+                child = subprocess.run([sys.executable, "-m", "benchmarks.bench_offline_pipeline", "--child", scenario,
+                                        "--step", step, "--url", url], env=env, capture_output=True, text=True)
+                if child.returncode:
+                    print(f"{scenario:<9} {step:<24} failed:\n{child.stderr[-2000:]}")
+                    break
+                result = json.loads(child.stdout.strip().splitlines()[-1])
+                calls = result["calls"]
+                by_method = " ".join(f"{method}={count}" for method, count in sorted(calls.items()))
+                print(f"{scenario:<9} {result['step']:<24} {result['wall']:>8.2f} {sum(calls.values()):>6} "
+                      f"{result['bytes_in'] / 1024:>9.1f} {result['bytes_out'] / 1024:>10.1f} "
+                      f"{result['throttled']:>5} {result['peak_rss_mb']:>7.0f}MB {result['step_rss_mb']:>7.0f}MB  "
+                      f"{by_method}")
+    finally:
+        server.terminate()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compares the batchUpdate traffic of per-row deletes against the range-coalescing planner.
+
+Run from the repository root:  python -m benchmarks.bench_row_deletion
+"""
+import json
+import random
+import time
+
+from api.services.row_deletion import delete_range_request, plan_row_deletions
+
+SHEET_ID = 123456
+ROW_COUNT = 5001  # header + 5k data rows
+
+def legacy_plan(row_indices):
+    # One deleteDimension per row in a single batchUpdate, as delete_sheet_rows used to send
+    return [{"requests": [delete_range_request(SHEET_ID, idx, idx + 1)
+                          for idx in sorted(row_indices, reverse=True)]}]
+
+def measure(plan):
+    requests = sum(len(body["requests"]) for body in plan)
+    payload = sum(len(json.dumps(body, separators=(",", ":"))) for body in plan)
+    return len(plan), requests, payload
+
+def main():
+    rng = random.Random(42)
+    data_rows = range(1, ROW_COUNT)
+    scenarios = {
+        "whole sheet (5k rows)": list(data_rows),
+        "contiguous block (2k rows)": list(range(1000, 3000)),
+        "every other row (2.5k rows)": list(range(1, ROW_COUNT, 2)),
+        "random 10% (500 rows)": rng.sample(data_rows, 500),
+        "random 60% (3k rows)": rng.sample(data_rows, 3000),
+    }
+
+    print(f"{'scenario':<30} {'plan':<8} {'batches':>8} {'requests':>9} {'payload':>11} {'plan ms':>8}")
+    for name, indices in scenarios.items():
+        for label, planner in (("legacy", legacy_plan),
+                               ("ranges", lambda rows: plan_row_deletions(SHEET_ID, rows, row_count=ROW_COUNT))):
+            started = time.perf_counter()
+            plan = planner(indices)
+            elapsed = (time.perf_counter() - started) * 1000
+            batches, requests, payload = measure(plan)
+            print(f"{name:<30} {label:<8} {batches:>8} {requests:>9} {payload:>10}B {elapsed:>8.2f}")
+
+if __name__ == "__main__":
+    main()
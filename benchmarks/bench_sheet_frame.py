@@ -0,0 +1,103 @@
+"""Measures the email column reads of the pipeline on a 100k-row sheet: SheetFrame pages against (row_index, email) pairs.
+
+The sheet lives in a SQLite store. Two real read paths are timed and traced:
+
+* ``scan``: the first dedup scan, read_new_emails without a limit, which returns the
+  whole email column of the sheet at once;
+* ``stream``: a verification pass reading pages of VERIFY_PAGE_SIZE rows with
+  read_new_emails and read_email_pages until the end of the sheet.
+
+The pair lists are what those functions returned before they were routed through
+SheetFrame; they are built here from the same range reads. Reported: peak traced memory
+during the read, memory still held by the result, and wall time.
+
+Run from the repository root:  python -m benchmarks.bench_sheet_frame
+"""
+import gc
+import time
+import tracemalloc
+
+from api.config import EMAIL_COLUMN, VERIFY_PAGE_SIZE
+from api.services import sheet_cursor
+from api.services.sheet_cursor import SheetCursor, _cell, read_email_pages, read_new_emails
+from api.services.sheet_store import SQLiteSheetStore
+
+ROWS = 100_000
+SHEET = "GMAIL"
+
+def seed():
+    store = SQLiteSheetStore()
+    store.create_sheet(SHEET, ["first_name", "last_name", "country", EMAIL_COLUMN])
+    # One row in 20 has a blank email, never the last row of a page, where the API would trim it
+    store.append_rows(SHEET, [["First", f"Name {i}", "US", "" if i % 20 == 7 else f" User{i}@Example.com "]
+                              for i in range(ROWS)])
+    return store
+
+def pairs(values, first_row_index):
+    return [(first_row_index + offset, _cell(values, offset)) for offset in range(len(values))]
+
+def scan_frames(store):
+    cursor = SheetCursor()
+    return read_new_emails(store, [SHEET], cursors={SHEET: cursor})[SHEET]
+
+def scan_pairs(store):
+    cursor = SheetCursor()
+    read_new_emails(store, [SHEET], limit=1, cursors={SHEET: cursor})  # resolves the header
+    column = cursor.email_column
+    values = store.read_range(SHEET, f"{column}1:{column}")
+    return pairs(values[1:], 1)
+
+def stream_frames(store):
+    cursor = SheetCursor()
+    page = read_new_emails(store, [SHEET], VERIFY_PAGE_SIZE, cursors={SHEET: cursor})[SHEET]
+    # read_email_pages looks the column up in the verification cursors
+    sheet_cursor._cursors[SHEET] = cursor
+    rows = 0
+    while len(page) == VERIFY_PAGE_SIZE:
+        rows += len(page)
+        page = read_email_pages(store, {SHEET: page.row_indices[-1] + 1}, VERIFY_PAGE_SIZE)[SHEET]
+    sheet_cursor._cursors.pop(SHEET)
+    return rows + len(page)
+
+def stream_pairs(store):
+    cursor = SheetCursor()
+    read_new_emails(store, [SHEET], limit=1, cursors={SHEET: cursor})
+    column = cursor.email_column
+    start, rows = 1, 0
+    while True:
+        values = store.read_range(SHEET, f"{column}{start + 1}:{column}{start + VERIFY_PAGE_SIZE}")
+        page = pairs(values, start)
+        rows += len(page)
+        if len(page) < VERIFY_PAGE_SIZE:
+            return rows
+        start = page[-1][0] + 1
+
+def measure(read, store):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = read(store)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, current, elapsed
+
+def main():
+    store = seed()
+    print(f"{ROWS} rows, VERIFY_PAGE_SIZE={VERIFY_PAGE_SIZE}")
+    print(f"{'path':<8} {'representation':<15} {'peak MB':>8} {'held MB':>8} {'held B/row':>11} {'time s':>7}")
+    frame, *frame_stats = measure(scan_frames, store)
+    legacy, *legacy_stats = measure(scan_pairs, store)
+    assert list(frame.items(EMAIL_COLUMN)) == legacy
+    del frame, legacy
+    for name, (peak, held, elapsed) in (("pairs", legacy_stats), ("SheetFrame", frame_stats)):
+        print(f"{'scan':<8} {name:<15} {peak / 2**20:>8.1f} {held / 2**20:>8.1f} {held / ROWS:>11.0f} {elapsed:>7.2f}")
+    streamed = set()
+    for name, read in (("pairs", stream_pairs), ("SheetFrame", stream_frames)):
+        rows, peak, _, elapsed = measure(read, store)
+        streamed.add(rows)
+        print(f"{'stream':<8} {name:<15} {peak / 2**20:>8.1f} {'':>8} {'':>11} {elapsed:>7.2f}")
+    assert streamed == {ROWS}
+
+if __name__ == "__main__":
+    main()
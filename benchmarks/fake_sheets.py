@@ -0,0 +1,220 @@
+"""Local stand-in for the Sheets v4 REST API, for offline benchmarks.
+
+Implements the calls google_sheets_utils makes: spreadsheets.get, values.get,
+values.batchGet, values.append and batchUpdate (deleteDimension and the updateCells
+clear). Every request can be delayed by a fixed latency and answered with a 429 at a
+given rate. Control endpoints under /_fake/ seed sheets and report per-method call
+counts and bytes transferred.
+
+Point the app at it with SHEETS_API_ENDPOINT=http://127.0.0.1:<port>/ (see start_server).
+"""
+import collections
+import json
+import multiprocessing
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from api.services.sheet_store import DEFAULT_COLUMN_COUNT, parse_a1_range, trim_values
+
+class FakeSpreadsheet:
+    """In-memory sheets with Sheets API row semantics (0-based rows, deletions shift rows up)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sheets = {}  # title -> {"sheetId": int, "rows": [[str, ...], ...]}
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats():
+        return {"calls": collections.Counter(), "bytes_in": 0, "bytes_out": 0, "throttled": 0}
+
+    def seed(self, header, sheets, row_template):
+        """Replaces the named sheets with ``header`` plus generated rows; ``sheets`` maps title -> row count."""
+        with self.lock:
+            for title, row_count in sheets.items():
+                sheet_id = self.sheets[title]["sheetId"] if title in self.sheets else len(self.sheets) + 1
+                prefix = title.lower()
+                rows = [list(header)]
+                rows.extend([cell.format(i=i, sheet=prefix) for cell in row_template] for i in range(row_count))
+                self.sheets[title] = {"sheetId": sheet_id, "rows": rows}
+
+    def _sheet(self, cell_range):
+        if "!" in cell_range:
+            title, a1 = cell_range.rsplit("!", 1)
+        else:
+            title, a1 = cell_range, "A:Z"
+        title = title.strip("'")
+        if title not in self.sheets:
+            raise KeyError(f"Unable to parse range: {cell_range}")
+        return self.sheets[title], a1
+
+    def read(self, cell_range):
+        with self.lock:
+            sheet, a1 = self._sheet(cell_range)
+            row_start, row_end, col_start, col_end = parse_a1_range(a1)
+            rows = [row[col_start:col_end] for row in sheet["rows"][row_start:row_end]]
+        value_range = {"range": cell_range, "majorDimension": "ROWS"}
+        values = trim_values(rows)
+        if values:
+            value_range["values"] = values
+        return value_range
+
+    def append(self, cell_range, values):
+        with self.lock:
+            sheet, _ = self._sheet(cell_range)
+            sheet["rows"].extend([str(cell) for cell in row] for row in values)
+        return {"updates": {"updatedRange": cell_range, "updatedRows": len(values)}}
+
+    def properties(self):
+        with self.lock:
+            return {"sheets": [{"properties": {"sheetId": sheet["sheetId"], "title": title, "index": index,
+                                               "gridProperties": {"rowCount": len(sheet["rows"]),
+                                                                  "columnCount": DEFAULT_COLUMN_COUNT}}}
+                               for index, (title, sheet) in enumerate(self.sheets.items())]}
+
+    def batch_update(self, requests):
+        with self.lock:
+            by_id = {sheet["sheetId"]: sheet for sheet in self.sheets.values()}
+            pending = []  # deleteDimension ranges of one sheet, in descending order, applied in one pass
+            for request in requests:
+                if "deleteDimension" in request:
+                    grid = request["deleteDimension"]["range"]
+                    sheet = by_id[grid["sheetId"]]
+                    span = (grid["startIndex"], grid["endIndex"])
+                    if pending and (pending[0][0] is not sheet or span[1] > pending[-1][1][0]):
+                        self._delete_spans(pending)
+                        pending = []
+                    pending.append((sheet, span))
+                elif "updateCells" in request:
+                    self._delete_spans(pending)
+                    pending = []
+                    grid = request["updateCells"]["range"]
+                    rows = by_id[grid["sheetId"]]["rows"]
+                    for index in range(grid.get("startRowIndex", 0), min(grid.get("endRowIndex", len(rows)), len(rows))):
+                        rows[index] = []
+                else:
+                    raise ValueError(f"Unsupported request: {sorted(request)}")
+            self._delete_spans(pending)
+        return {"replies": [{} for _ in requests]}
+
+    @staticmethod
+    def _delete_spans(pending):
+        if not pending:
+            return
+        sheet = pending[0][0]
+        doomed = bytearray(len(sheet["rows"]))
+        for _, (start, end) in pending:
+            doomed[start:end] = b"\x01" * (min(end, len(doomed)) - start)
+        sheet["rows"] = [row for row, dropped in zip(sheet["rows"], doomed) if not dropped]
+
+class FakeSheetsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    spreadsheet = None
+    latency = 0.0
+    throttle_rate = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return len(body)
+
+    def _handle(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+        query = parse_qs(url.query)
+        if self.headers.get("X-HTTP-Method-Override") == "GET":
+            # googleapiclient sends GETs with long URLs (e.g. many batchGet ranges) as form-encoded POSTs
+            method = "GET"
+            query.update(parse_qs(raw.decode()))
+        stats = self.spreadsheet.stats
+
+        if path.startswith("/_fake/"):
+            return self._control(path, json.loads(raw) if raw else {})
+
+        if self.latency:
+            time.sleep(self.latency)
+        if self.throttle_rate and random.random() < self.throttle_rate:
+            with self.spreadsheet.lock:
+                stats["throttled"] += 1
+            self._reply(429, {"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}})
+            return
+
+        rest = path.split("/v4/spreadsheets/", 1)[-1]
+        spreadsheet_id, _, tail = rest.partition("/")
+        try:
+            if method == "GET" and not tail:
+                name, payload = "get", self.spreadsheet.properties()
+            elif method == "GET" and tail == "values:batchGet":
+                name = "values.batchGet"
+                payload = {"valueRanges": [self.spreadsheet.read(r) for r in query.get("ranges", [])]}
+            elif method == "GET" and tail.startswith("values/"):
+                name, payload = "values.get", self.spreadsheet.read(tail[len("values/"):])
+            elif method == "POST" and tail.startswith("values/") and tail.endswith(":append"):
+                name = "values.append"
+                payload = self.spreadsheet.append(tail[len("values/"):-len(":append")], json.loads(raw)["values"])
+            elif method == "POST" and spreadsheet_id.endswith(":batchUpdate"):
+                name, payload = "batchUpdate", self.spreadsheet.batch_update(json.loads(raw)["requests"])
+            else:
+                name, payload = "unknown", None
+        except (KeyError, ValueError) as e:
+            self._reply(400, {"error": {"code": 400, "message": str(e), "status": "INVALID_ARGUMENT"}})
+            return
+        if payload is None:
+            self._reply(404, {"error": {"code": 404, "message": f"No route for {method} {path}", "status": "NOT_FOUND"}})
+            return
+        sent = self._reply(200, payload)
+        with self.spreadsheet.lock:
+            stats["calls"][name] += 1
+            stats["bytes_in"] += len(self.path) + len(raw)
+            stats["bytes_out"] += sent
+
+    def _control(self, path, body):
+        spreadsheet = self.spreadsheet
+        if path == "/_fake/seed":
+            spreadsheet.seed(body["header"], body["sheets"], body["row_template"])
+            return self._reply(200, {})
+        if path == "/_fake/stats":
+            with spreadsheet.lock:
+                stats = dict(spreadsheet.stats, calls=dict(spreadsheet.stats["calls"]))
+                if body.get("reset"):
+                    spreadsheet.stats = spreadsheet._empty_stats()
+            return self._reply(200, stats)
+        if path == "/_fake/config":
+            type(self).latency = body.get("latency", self.latency)
+            type(self).throttle_rate = body.get("throttle_rate", self.throttle_rate)
+            return self._reply(200, {})
+        return self._reply(404, {})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+def serve(port_pipe, latency=0.0, throttle_rate=0.0):
+    handler = type("Handler", (FakeSheetsHandler,), {"spreadsheet": FakeSpreadsheet(), "latency": latency,
+                                                     "throttle_rate": throttle_rate})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    port_pipe.send(server.server_address[1])
+    server.serve_forever()
+
+def start_server(latency=0.0, throttle_rate=0.0):
+    """Starts the fake server in a child process; returns (process, base URL)."""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=serve, args=(sender, latency, throttle_rate), daemon=True)
+    process.start()
+    port = receiver.recv()
+    return process, f"http://127.0.0.1:{port}/"
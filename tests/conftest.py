@@ -0,0 +1,15 @@
+import pytest
+
+from api.services import sheet_cursor
+from api.services.sheet_store import SQLiteSheetStore
+
+@pytest.fixture(autouse=True)
+def reset_verification_cursors():
+    # The verification cursors are process-wide; every test starts from unscanned sheets
+    sheet_cursor._cursors.clear()
+    yield
+    sheet_cursor._cursors.clear()
+
+@pytest.fixture
+def store():
+    return SQLiteSheetStore()
@@ -0,0 +1,16 @@
+from api.config import EMAIL_COLUMN
+
+HEADER = ["first_name", "last_name", EMAIL_COLUMN]
+
+def make_rows(emails):
+    return [["First", "Last", email] for email in emails]
+
+def emails_of(store, sheet_name):
+    return [row[2] for row in store.read_range(sheet_name)[1:] if len(row) > 2]
+
+class ServerError(Exception):
+    """Stands in for an HttpError; the quota governor reads the status from ``status_code``."""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
@@ -0,0 +1,37 @@
+from api.services.change_gate import ChangeGate
+
+def test_unchanged_sheets_back_off_up_to_the_cap():
+    gate = ChangeGate(min_interval=60, max_interval=300)
+    now = 0.0
+    intervals = []
+    for _ in range(5):
+        assert gate.due(["GMAIL"], now) == ["GMAIL"]
+        gate.record("GMAIL", False, now)
+        intervals.append(gate.next_delay(now))
+        now += intervals[-1]
+    assert intervals == [120, 240, 300, 300, 300]
+
+def test_a_change_brings_the_interval_back_down():
+    gate = ChangeGate(min_interval=60, max_interval=300)
+    gate.record("GMAIL", False, 0)
+    gate.record("GMAIL", False, 120)
+    gate.record("GMAIL", True, 360)
+    assert gate.next_delay(360) == 60
+
+def test_sheets_are_due_from_half_their_interval():
+    gate = ChangeGate(min_interval=60, max_interval=600)
+    gate.record("GMAIL", False, 0)  # next due at 120
+    gate.record("AOL", True, 0)  # next due at 60
+
+    assert gate.due(["GMAIL", "AOL", "NEW"], 30) == ["AOL", "NEW"]
+    assert gate.due(["GMAIL", "AOL"], 59) == ["AOL"]
+    assert gate.due(["GMAIL", "AOL"], 60) == ["GMAIL", "AOL"]
+    # Never less than the base interval, even once a sheet is overdue
+    assert gate.next_delay(100) == 60
+
+def test_reset_makes_every_sheet_due():
+    gate = ChangeGate(min_interval=60, max_interval=300)
+    gate.record("GMAIL", False, 0)
+    gate.reset()
+    assert gate.due(["GMAIL"], 1) == ["GMAIL"]
+    assert gate.next_delay(1) is None
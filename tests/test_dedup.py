@@ -0,0 +1,85 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api.config import VERIFIED_SHEET_NAME
+from api.services import verify_emails
+from api.services.async_sheet_store import AsyncSheetStore
+from api.services.dedup import DedupEngine
+from api.services.email_index import EmailIndex
+from api.services.row_mover import MoveJournal
+
+from tests.helpers import HEADER, emails_of, make_rows
+
+SHEETS = [VERIFIED_SHEET_NAME, "GMAIL"]
+
+class FixedRouter:
+    async def route_domains(self, domains):
+        return {domain: "GMAIL" for domain in domains}
+
+@pytest.fixture
+def pipeline(store, tmp_path, monkeypatch):
+    for sheet_name in SHEETS + ["PROCESSOR"]:
+        store.create_sheet(sheet_name, HEADER)
+    index = EmailIndex(str(tmp_path / "index.db"))
+    journal = MoveJournal(str(tmp_path / "journal.db"))
+    monkeypatch.setattr(verify_emails, "get_email_index", lambda: index)
+    monkeypatch.setattr(verify_emails, "get_move_journal", lambda: journal)
+    async_store = AsyncSheetStore(store)
+    yield async_store, index
+    async_store.shutdown()
+
+def dedup(async_store, index):
+    return asyncio.run(DedupEngine(async_store, index, router=FixedRouter(), sheet_names=SHEETS).run())
+
+def verify(async_store, existing):
+    def verifier(request):
+        return httpx.Response(200, json={"account_exists": request.url.params["email"] in existing})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(verifier)) as client:
+            await verify_emails.verify_sheets(["GMAIL"], store=async_store, client=client)
+    asyncio.run(run())
+
+@pytest.mark.parametrize("scan_before_verify", [False, True])
+def test_verified_rows_survive_the_next_dedup(store, pipeline, scan_before_verify):
+    async_store, index = pipeline
+    store.append_rows("PROCESSOR", make_rows(["a@gmail.com", "b@gmail.com", "gone@gmail.com"]))
+
+    assert dedup(async_store, index) == {"routed": 3, "deleted": 3}
+    if scan_before_verify:
+        # GMAIL's routed rows get indexed at their real positions before verification moves them
+        assert dedup(async_store, index) == {"routed": 0, "deleted": 0}
+    verify(async_store, existing={"a@gmail.com", "b@gmail.com"})
+    assert emails_of(store, "GMAIL") == []
+    assert emails_of(store, VERIFIED_SHEET_NAME) == ["a@gmail.com", "b@gmail.com"]
+
+    assert dedup(async_store, index) == {"routed": 0, "deleted": 0}
+    assert emails_of(store, VERIFIED_SHEET_NAME) == ["a@gmail.com", "b@gmail.com"]
+
+    # A verified address coming back is a duplicate; one verification dropped is routed again
+    store.append_rows("PROCESSOR", make_rows(["A@gmail.com", "gone@gmail.com"]))
+    assert dedup(async_store, index) == {"routed": 1, "deleted": 2}
+    assert emails_of(store, "GMAIL") == ["gone@gmail.com"]
+    assert emails_of(store, VERIFIED_SHEET_NAME) == ["a@gmail.com", "b@gmail.com"]
+
+def test_moves_keep_the_scan_cursors_incremental(store, pipeline):
+    async_store, index = pipeline
+    store.append_rows("GMAIL", make_rows(["keep@gmail.com"]))
+    store.append_rows("PROCESSOR", make_rows(["a@gmail.com", "b@gmail.com"]))
+    dedup(async_store, index)
+    dedup(async_store, index)
+    assert index.load_cursors(["GMAIL"])["GMAIL"].processed_rows == 4
+
+    verify(async_store, existing={"a@gmail.com", "b@gmail.com"})
+    cursor = index.load_cursors(["GMAIL"])["GMAIL"]
+    assert (cursor.processed_rows, cursor.fingerprint) == (1, HEADER[2])  # keep@ had no account either
+
+    store.append_rows("GMAIL", make_rows(["new@gmail.com"]))
+    reads = []
+    read_ranges = store.read_ranges
+    store.read_ranges = lambda ranges: reads.append(ranges) or read_ranges(ranges)
+    assert dedup(async_store, index) == {"routed": 0, "deleted": 0}
+    # Only the rows after each watermark are read, no sheet is rescanned from its header
+    assert all(not cell_range.startswith("A1") for ranges in reads for _, cell_range in ranges)
@@ -0,0 +1,51 @@
+import asyncio
+import os
+
+from api.services.domain_classifier import DomainTable, _parse_disposable, _parse_provider
+
+def write(path, lines, mtime):
+    path.write_text("\n".join(["# comment", ""] + lines) + "\n", encoding="utf-8")
+    os.utime(path, ns=(mtime, mtime))
+
+def test_disposable_domains_match_their_subdomains(tmp_path):
+    path = tmp_path / "disposable.txt"
+    write(path, ["mailinator.com", "Trashmail.COM"], 1)
+    table = DomainTable(str(path), _parse_disposable)
+
+    assert table.lookup("mailinator.com", False) is True
+    assert table.get("x.y.mailinator.com", False) is True
+    assert table.get("trashmail.com", False) is True
+    assert table.get("notmailinator.com", False) is False
+    assert table.get("com", False) is False
+    assert len(table) == 2
+
+def test_provider_domains_match_exactly(tmp_path):
+    path = tmp_path / "providers.txt"
+    write(path, ["gmail.com GMAIL", "mail.example.com OUTLOOK"], 1)
+    table = DomainTable(str(path), _parse_provider, match_parents=False)
+    asyncio.run(table.refresh())
+
+    assert table.get("gmail.com") == "GMAIL"
+    assert table.get("mail.gmail.com") is None
+    assert table.get("mail.example.com") == "OUTLOOK"
+    assert table.get("example.com") is None
+
+def test_the_most_specific_listed_parent_wins(tmp_path):
+    path = tmp_path / "providers.txt"
+    write(path, ["example.com GENERIC", "eu.example.com EU"], 1)
+    table = DomainTable(str(path), _parse_provider)
+    asyncio.run(table.refresh())
+
+    assert table.get("a.eu.example.com") == "EU"
+    assert table.get("a.us.example.com") == "GENERIC"
+
+def test_edits_are_picked_up_on_refresh(tmp_path):
+    path = tmp_path / "providers.txt"
+    write(path, ["gmail.com GMAIL"], 1)
+    table = DomainTable(str(path), _parse_provider, match_parents=False, reload_interval=0)
+    asyncio.run(table.refresh())
+    write(path, ["aol.com AOL"], 2)
+    asyncio.run(table.refresh())
+
+    assert table.get("aol.com") == "AOL"
+    assert table.get("gmail.com") is None
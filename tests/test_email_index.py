@@ -0,0 +1,50 @@
+import pytest
+
+from api.config import EMAIL_COLUMN
+from api.services.email_index import PENDING_ROW, EmailIndex, email_key
+
+from tests.helpers import HEADER
+
+@pytest.fixture
+def index(tmp_path):
+    return EmailIndex(str(tmp_path / "index.db"))
+
+def test_rows_below_deletions_shift_up(index):
+    index.add([(email_key(f"user{i}@example.com"), "GMAIL", i) for i in range(1, 11)])
+    index.add([(email_key("other@example.com"), "AOL", 9)])
+    index.shift_after_deletions("GMAIL", [2, 3, 7])
+
+    found = index.lookup(email_key(f"user{i}@example.com") for i in range(1, 11))
+    assert [found[email_key(f"user{i}@example.com")][1] for i in (1, 4, 5, 6, 8, 9, 10)] == [1, 2, 3, 4, 5, 6, 7]
+    assert index.lookup([email_key("other@example.com")]) == {email_key("other@example.com"): ("AOL", 9)}
+
+def test_cursors_round_trip(index):
+    cursors = index.load_cursors(["GMAIL", "AOL"])
+    cursors["GMAIL"].set_header(HEADER)
+    cursors["GMAIL"].processed_rows = 5
+    cursors["GMAIL"].fingerprint = "e@example.com"
+    index.save_cursors(cursors)
+
+    loaded = index.load_cursors(["GMAIL", "AOL"])
+    assert (loaded["GMAIL"].processed_rows, loaded["GMAIL"].fingerprint) == (5, "e@example.com")
+    assert loaded["GMAIL"].email_col_index == HEADER.index(EMAIL_COLUMN)
+    assert loaded["AOL"].header is None
+
+def test_moves_rekey_emails_and_pull_the_watermark_up(index):
+    index.add([(email_key(f"user{i}@example.com"), "GMAIL", i) for i in range(1, 6)])
+    cursors = index.load_cursors(["GMAIL"])
+    cursors["GMAIL"].set_header(HEADER)
+    cursors["GMAIL"].processed_rows = 6
+    cursors["GMAIL"].fingerprint = "user5@example.com"
+    index.save_cursors(cursors)
+
+    stale = index.record_moves("VERIFIED", [["GMAIL", 2, "User2@Example.com", True], ["GMAIL", 5, "user5@example.com", False]])
+
+    found = index.lookup(email_key(f"user{i}@example.com") for i in range(1, 6))
+    assert found == {email_key("user1@example.com"): ("GMAIL", 1), email_key("user2@example.com"): ("VERIFIED", PENDING_ROW),
+                     email_key("user3@example.com"): ("GMAIL", 2), email_key("user4@example.com"): ("GMAIL", 3)}
+    assert index.load_cursors(["GMAIL"])["GMAIL"].processed_rows == 4
+    # Row 5 closed the scanned rows; the cell now closing them must be fingerprinted again
+    assert stale == {"GMAIL": "C4"}
+    index.set_fingerprints({"GMAIL": "user4@example.com"})
+    assert index.load_cursors(["GMAIL"])["GMAIL"].fingerprint == "user4@example.com"
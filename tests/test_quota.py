@@ -0,0 +1,59 @@
+import pytest
+
+from api.services import quota
+from api.services.quota import QuotaGovernor, retry_deadline
+
+from tests.helpers import ServerError
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(quota, "time", clock)
+    return clock
+
+def failing(status, calls):
+    def call():
+        calls.append(status)
+        raise ServerError(status)
+    return call
+
+def test_reads_retry_until_the_deadline(clock):
+    governor = QuotaGovernor(max_retries=10, base_delay=10, max_delay=10, retry_time=25)
+    calls = []
+    with pytest.raises(ServerError):
+        governor.execute(failing(500, calls), 'read')
+
+    assert 1 < len(calls) < 11
+    assert clock.now <= 25
+    assert governor.stats()['read']['failed'] == 1
+
+def test_an_explicit_deadline_wins_over_the_context(clock):
+    governor = QuotaGovernor(max_retries=10, base_delay=1, max_delay=1)
+    calls = []
+    with retry_deadline(100), pytest.raises(ServerError):
+        governor.execute(failing(503, calls), 'read', deadline=0.5)
+    assert len(calls) == 1 and clock.sleeps == []
+
+def test_writes_are_not_retried_on_a_500(clock):
+    governor = QuotaGovernor(max_retries=5, base_delay=1)
+    calls = []
+    with pytest.raises(ServerError):
+        governor.execute(failing(500, calls), 'write')
+    assert calls == [500]
+
+    calls.clear()
+    with pytest.raises(ServerError):
+        governor.execute(failing(429, calls), 'write')
+    assert calls == [429] * 6
@@ -0,0 +1,43 @@
+from api.services.row_deletion import coalesce_row_ranges, merge_batches, plan_row_deletions
+
+def apply(rows, batches):
+    """Applies deleteDimension/updateCells requests to a list of rows, like batchUpdate does."""
+    rows = list(rows)
+    for body in batches:
+        for request in body["requests"]:
+            if "deleteDimension" in request:
+                target = request["deleteDimension"]["range"]
+                del rows[target["startIndex"]:target["endIndex"]]
+            else:
+                target = request["updateCells"]["range"]
+                rows[target["startRowIndex"]:target["endRowIndex"]] = [""] * (target["endRowIndex"] - target["startRowIndex"])
+    return rows
+
+def test_coalesce_merges_runs_highest_first():
+    assert coalesce_row_ranges([5, 1, 2, 3, 9, 2, 6]) == [(9, 10), (5, 7), (1, 4)]
+    assert coalesce_row_ranges([]) == []
+
+def test_batches_delete_exactly_the_requested_rows():
+    rows = [f"row{i}" for i in range(50)]
+    doomed = {1, 2, 3, 7, 20, 21, 33, 49}
+    batches = plan_row_deletions(0, doomed, max_requests=2)
+
+    assert [len(body["requests"]) for body in batches] == [2, 2, 1]
+    assert apply(rows, batches) == [row for i, row in enumerate(rows) if i not in doomed]
+
+def test_emptying_a_sheet_keeps_one_cleared_data_row():
+    batches = plan_row_deletions(0, range(1, 10), row_count=10)
+
+    assert len(batches) == 1
+    assert apply([f"row{i}" for i in range(10)], batches) == ["row0", ""]
+    assert plan_row_deletions(0, range(1, 9), row_count=10)[0]["requests"][0]["deleteDimension"]["range"] == {
+        "sheetId": 0, "dimension": "ROWS", "startIndex": 1, "endIndex": 9}
+
+def test_merged_batches_keep_each_sheet_highest_first():
+    plans = [plan_row_deletions(1, [2, 5, 8]), plan_row_deletions(2, [4, 6])]
+    batches = merge_batches(plans, max_requests=4)
+
+    assert [len(body["requests"]) for body in batches] == [4, 1]
+    starts = [(r["deleteDimension"]["range"]["sheetId"], r["deleteDimension"]["range"]["startIndex"])
+              for body in batches for r in body["requests"]]
+    assert starts == [(1, 8), (1, 5), (1, 2), (2, 6), (2, 4)]
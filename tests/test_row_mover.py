@@ -0,0 +1,104 @@
+import pytest
+
+from api.config import VERIFIED_SHEET_NAME
+from api.services.quota import QuotaGovernor
+from api.services.row_mover import APPENDED, DONE, MoveJournal, RowMover
+from api.services.sheet_store import SQLiteSheetStore
+
+from tests.helpers import HEADER, ServerError, emails_of, make_rows
+
+class FailingAppendStore(SQLiteSheetStore):
+    """Answers the next append with a 500, after applying it when ``lands`` is set."""
+
+    def __init__(self, lands):
+        super().__init__()
+        self.governor = QuotaGovernor(base_delay=0)
+        self.lands = lands
+        self.failing = False
+        self.appends = 0
+
+    def append_rows(self, sheet_name, rows):
+        def call():
+            self.appends += 1
+            if self.lands or not self.failing:
+                SQLiteSheetStore.append_rows(self, sheet_name, rows)
+            if self.failing:
+                self.failing = False
+                raise ServerError(500)
+        return self.governor.execute(call, 'write')
+
+@pytest.fixture
+def journal(tmp_path):
+    return MoveJournal(str(tmp_path / "journal.db"))
+
+def seeded(store):
+    for sheet_name in (VERIFIED_SHEET_NAME, "GMAIL"):
+        store.create_sheet(sheet_name, HEADER)
+    store.append_rows("GMAIL", make_rows(["a@example.com", "b@example.com", "c@example.com"]))
+    return store
+
+@pytest.mark.parametrize("lands", [False, True])
+def test_a_failed_append_surfaces_and_resume_reconciles_it(journal, lands):
+    store = seeded(FailingAppendStore(lands))
+    mover = RowMover(store, journal, VERIFIED_SHEET_NAME)
+    store.appends = 0
+    store.failing = True
+
+    with pytest.raises(ServerError):
+        mover.commit({"GMAIL": [(1, "a@example.com", True), (2, "b@example.com", False)]})
+    assert store.appends == 1  # appends are not idempotent, so a 500 is not retried
+    assert emails_of(store, "GMAIL") == ["a@example.com", "b@example.com", "c@example.com"]
+
+    assert mover.resume() == 1
+    assert journal.unfinished() == []
+    if lands:
+        assert emails_of(store, VERIFIED_SHEET_NAME) == ["a@example.com"]
+        assert emails_of(store, "GMAIL") == ["c@example.com"]
+    else:
+        assert emails_of(store, VERIFIED_SHEET_NAME) == []
+        assert emails_of(store, "GMAIL") == ["a@example.com", "b@example.com", "c@example.com"]
+    assert mover.resume() == 0
+
+def test_the_journal_survives_a_restart(tmp_path):
+    path = str(tmp_path / "journal.db")
+    journal = MoveJournal(path)
+    entries = [["GMAIL", 1, "a@example.com", True]]
+    first = journal.begin(VERIFIED_SHEET_NAME, entries)
+    second = journal.begin(VERIFIED_SHEET_NAME, entries)
+    journal.mark(first, APPENDED)
+    journal.mark(second, DONE)
+
+    assert MoveJournal(path).unfinished() == [(first, VERIFIED_SHEET_NAME, entries, APPENDED)]
+
+def test_commit_moves_and_deletes_in_one_chunk(journal, store):
+    seeded(store)
+    moved = RowMover(store, journal, VERIFIED_SHEET_NAME).commit(
+        {"GMAIL": [(3, "c@example.com", True), (1, "a@example.com", True), (2, "b@example.com", False)]})
+
+    assert moved == 2
+    assert emails_of(store, VERIFIED_SHEET_NAME) == ["a@example.com", "c@example.com"]
+    assert emails_of(store, "GMAIL") == []
+    assert journal.unfinished() == []
+
+def test_resume_only_deletes_rows_that_still_hold_the_journaled_email(journal, store):
+    seeded(store)
+    chunk_id = journal.begin(VERIFIED_SHEET_NAME, [["GMAIL", 1, "a@example.com", True], ["GMAIL", 3, "c@example.com", True]])
+    store.append_rows(VERIFIED_SHEET_NAME, make_rows(["a@example.com", "c@example.com"]))
+    journal.mark(chunk_id, APPENDED)
+    # Someone edited row 3 before the restart
+    store.delete_rows("GMAIL", [3])
+    store.append_rows("GMAIL", make_rows(["z@example.com"]))
+
+    assert RowMover(store, journal, VERIFIED_SHEET_NAME).resume() == 1
+    assert emails_of(store, "GMAIL") == ["b@example.com", "z@example.com"]
+    assert emails_of(store, VERIFIED_SHEET_NAME) == ["a@example.com", "c@example.com"]
+    assert journal.unfinished() == []
+
+def test_a_pending_chunk_whose_append_landed_is_finished(journal, store):
+    seeded(store)
+    journal.begin(VERIFIED_SHEET_NAME, [["GMAIL", 2, "b@example.com", True]])
+    store.append_rows(VERIFIED_SHEET_NAME, make_rows(["b@example.com"]))
+
+    assert RowMover(store, journal, VERIFIED_SHEET_NAME).resume() == 1
+    assert emails_of(store, "GMAIL") == ["a@example.com", "c@example.com"]
+    assert journal.unfinished() == []
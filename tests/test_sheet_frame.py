@@ -0,0 +1,50 @@
+from api.config import EMAIL_COLUMN
+from api.services.sheet_cursor import SheetCursor, get_sheet_cursor, read_email_pages, read_new_emails
+from api.services.sheet_frame import SheetFrame
+
+from tests.helpers import HEADER, make_rows
+
+def test_frame_projects_and_filters_ragged_rows():
+    values = [HEADER + ["status"], ["Ann", "Lee", " Ann@Example.com ", "new"], ["Bob"], ["Cy", "Ho", "cy@example.com"]]
+    frame = SheetFrame.from_values(values)
+
+    assert len(frame) == 3 and frame.width == 4
+    assert list(frame.row_indices) == [1, 2, 3]
+    emails = frame.project([EMAIL_COLUMN])
+    kept = emails.filter(emails.nonblank(EMAIL_COLUMN))
+    assert list(kept.row_indices) == [1, 3]
+    assert kept.normalized(EMAIL_COLUMN) == ("ann@example.com", "cy@example.com")
+    assert frame.column("status") == ("new", "", "")
+    assert frame.take_rows([3]).rows() == [["Cy", "Ho", "cy@example.com"]]
+
+def test_read_frame_takes_the_header_from_row_one_only(store):
+    store.create_sheet("GMAIL", HEADER)
+    store.append_rows("GMAIL", make_rows(["a@example.com", "b@example.com"]))
+
+    frame = store.read_frame("GMAIL")
+    assert frame.header == HEADER
+    assert list(frame.items(EMAIL_COLUMN)) == [(1, "a@example.com"), (2, "b@example.com")]
+    tail = store.read_frame("GMAIL", "C3:C")
+    assert list(tail.items(0)) == [(2, "b@example.com")]
+
+def test_email_pages_are_frames_of_stripped_cells(store):
+    store.create_sheet("GMAIL", HEADER)
+    store.append_rows("GMAIL", make_rows([" a@example.com", "", "c@example.com", "d@example.com"]))
+    cursor = get_sheet_cursor("GMAIL")
+
+    page = read_new_emails(store, ["GMAIL"], limit=3)["GMAIL"]
+    assert list(page.items(EMAIL_COLUMN)) == [(1, "a@example.com"), (2, ""), (3, "c@example.com")]
+    assert cursor.advance(page.items(EMAIL_COLUMN), {1, 3}) is True
+    assert cursor.processed_rows == 2
+
+    page = read_email_pages(store, {"GMAIL": 3}, 2)["GMAIL"]
+    assert list(page.items(EMAIL_COLUMN)) == [(3, "c@example.com"), (4, "d@example.com")]
+
+def test_full_scan_returns_every_row_after_the_watermark(store):
+    store.create_sheet("GMAIL", HEADER)
+    store.append_rows("GMAIL", make_rows([f"user{i}@example.com" for i in range(5)]))
+    cursor = SheetCursor()
+
+    frame = read_new_emails(store, ["GMAIL"], cursors={"GMAIL": cursor})["GMAIL"]
+    assert list(frame.row_indices) == [1, 2, 3, 4, 5]
+    assert frame.column(EMAIL_COLUMN)[-1] == "user4@example.com"
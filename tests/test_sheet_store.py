@@ -0,0 +1,29 @@
+import pytest
+
+from api.services.sheet_store import SheetStore
+
+from tests.helpers import HEADER, emails_of, make_rows
+
+def test_sheet_store_requires_the_primitive_operations():
+    class ReadOnlyStore(SheetStore):
+        def read_range(self, sheet_name, cell_range='A:Z'):
+            return []
+
+    with pytest.raises(TypeError):
+        ReadOnlyStore()
+
+def test_unknown_sheets_are_reported_as_such(store):
+    with pytest.raises(ValueError, match="Unknown sheet: MISSING"):
+        store.read_range("MISSING")
+    assert store.get_sheet_properties("MISSING") is None
+
+def test_reads_are_trimmed_and_deletions_shift_rows_up(store):
+    store.create_sheet("GMAIL", HEADER)
+    store.append_rows("GMAIL", make_rows(["a@example.com", "b@example.com", "c@example.com", "d@example.com"])
+                      + [["", "", ""]])
+
+    assert store.read_range("GMAIL", "C2:C") == [["a@example.com"], ["b@example.com"], ["c@example.com"], ["d@example.com"]]
+    assert store.read_range("GMAIL", "A3:B3") == [["First", "Last"]]
+    store.delete_rows_in_sheets({"GMAIL": [1, 3]})
+    assert emails_of(store, "GMAIL") == ["b@example.com", "d@example.com"]
+    assert store.read_ranges([("GMAIL", "C2"), ("GMAIL", "C3")]) == [[["b@example.com"]], [["d@example.com"]]]